@@ -0,0 +1,92 @@
+"""
+Benchmark the cost of durable record writes.
+
+Measures the latency of logging one cleared level (a single fsynced
+append, plus the occasional atomic checkpoint) and the time needed to
+reopen a long log with and without its checkpoint.
+
+Usage:
+    python benchmarks/bench_durability.py [--levels N] [--budget-ms MS]
+
+Exits with status 1 if the 99th percentile per-level latency exceeds the
+budget.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from records_log import RecordLog, CHECKPOINT_FILE  # noqa: E402
+
+
+def percentile(values, fraction):
+    """Return the value at a fraction of a sorted copy of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_appends(folder, levels):
+    """Return per-level append latencies in milliseconds."""
+    log = RecordLog(folder)
+    latencies = []
+    for i in range(levels):
+        record = {'k': 'trial', 'g': 'Spatial Memory Game', 'lv': i % 20 + 1, 'ok': 1,
+                  'seq': list(range(i % 20 + 1)), 'resp': list(range(i % 20 + 1))}
+        start = time.perf_counter()
+        log.append(record)
+        latencies.append((time.perf_counter() - start) * 1000)
+    log.close()
+    return latencies
+
+
+def bench_recovery(folder):
+    """Return (ms, records replayed) for opening with and without checkpoint."""
+    start = time.perf_counter()
+    log = RecordLog(folder)
+    with_checkpoint = ((time.perf_counter() - start) * 1000, log.replayed)
+    log.close()
+
+    os.remove(os.path.join(folder, CHECKPOINT_FILE))
+    start = time.perf_counter()
+    log = RecordLog(folder)
+    without_checkpoint = ((time.perf_counter() - start) * 1000, log.replayed)
+    log.close()
+    return with_checkpoint, without_checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--levels', type=int, default=2000, help='levels to log')
+    parser.add_argument('--budget-ms', type=float, default=20.0,
+                        help='p99 latency budget per level in milliseconds')
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix='memorygames-bench-')
+    try:
+        latencies = bench_appends(folder, args.levels)
+        p50 = percentile(latencies, 0.50)
+        p99 = percentile(latencies, 0.99)
+        print(f"levels logged:      {args.levels}")
+        print(f"per-level p50:      {p50:.3f} ms")
+        print(f"per-level p99:      {p99:.3f} ms")
+        print(f"per-level max:      {max(latencies):.3f} ms")
+
+        (ckpt_ms, ckpt_n), (full_ms, full_n) = bench_recovery(folder)
+        print(f"reopen, checkpoint: {ckpt_ms:.3f} ms ({ckpt_n} records replayed)")
+        print(f"reopen, full scan:  {full_ms:.3f} ms ({full_n} records replayed)")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    if p99 > args.budget_ms:
+        print(f"FAIL: p99 {p99:.3f} ms exceeds budget of {args.budget_ms} ms")
+        return 1
+    print(f"OK: p99 within budget of {args.budget_ms} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Benchmark headless game simulation.
+
+Plays games on the toolkit-free engines with a simulated player and
+reports the simulated responses per minute, along with the distribution
+of scores, which doubles as a quick norm table for that player.
+
+Usage:
+    python benchmarks/bench_engine.py [--games N] [--span S] [--lapse P]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from games.engine import SpatialEngine, CorsiEngine, SpanEngine, span_player, simulate  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=20000, help='games per engine')
+    parser.add_argument('--span', type=int, default=7, help='span of the simulated player')
+    parser.add_argument('--lapse', type=float, default=0.02,
+                        help='chance of the player forgetting any one item')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the engines')
+    args = parser.parse_args()
+
+    player = span_player(args.span, args.lapse)
+    engines = (
+        ('Spatial Memory Game', SpatialEngine(3, seed=args.seed)),
+        ('Corsi Block Test', CorsiEngine(12, seed=args.seed)),
+        ('Memory Span', SpanEngine(seed=args.seed)),
+    )
+    for name, engine in engines:
+        start = time.perf_counter()
+        scores, trials = simulate(engine, player, args.games)
+        elapsed = time.perf_counter() - start
+
+        counts = Counter(scores)
+        print(f"{name}")
+        print(f"  games:            {args.games} in {elapsed:.2f} s")
+        print(f"  responses/minute: {trials / elapsed * 60:,.0f}")
+        print(f"  score mean:       {statistics.mean(scores):.2f} "
+              f"(sd {statistics.pstdev(scores):.2f})")
+        print("  score share:      " + ", ".join(
+            f"{score}: {counts[score] / len(scores):.1%}" for score in sorted(counts)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
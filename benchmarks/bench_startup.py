@@ -0,0 +1,101 @@
+"""
+Benchmark the time from program start to the first paint of the menu.
+
+Each run starts a fresh interpreter, builds the main window and menu the
+way main.py does and processes pending draws, then reports the elapsed
+time. Two startups are compared:
+
+    eager   all game modules imported and every game constructed up front
+    lazy    games registered in a GameRegistry, loaded on first use
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N]
+
+Needs customtkinter and a display.
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+CHILD = '''
+import time
+start = time.perf_counter()
+import sys
+sys.path.insert(0, {src!r})
+import customtkinter as ctk
+from menu import MainMenu
+
+ctk.set_appearance_mode("light")
+ctk.set_default_color_theme("blue")
+app = ctk.CTk()
+app.geometry("800x600")
+
+def show_main_menu():
+    pass
+
+if {eager!r}:
+    from games.spatial_memory_game import SpatialMemoryGame
+    from games.corsi_block_test import CorsiBlockTest
+    from games.memory_span_game import MemorySpanGame
+    games = [cls(app, show_main_menu)
+             for cls in (SpatialMemoryGame, CorsiBlockTest, MemorySpanGame)]
+    callbacks = dict(zip(('spatial', 'corsi', 'span'), (g.start for g in games)))
+else:
+    from games.registry import GameRegistry
+    registry = GameRegistry(app, show_main_menu)
+    callbacks = {{name: registry.starter(name) for name in registry.names()}}
+
+MainMenu(app, callbacks).show()
+app.update()
+print((time.perf_counter() - start) * 1000)
+app.destroy()
+'''
+
+
+def time_startup(eager, env):
+    """Return the milliseconds one fresh process takes to paint the menu."""
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD.format(src=SRC, eager=eager)],
+        capture_output=True, text=True, check=True, env=env
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='startups per variant')
+    args = parser.parse_args()
+
+    # The menu reads records and profiles, which creates the data folder;
+    # point it at a scratch directory so the user's data is not touched
+    home = tempfile.mkdtemp(prefix='memorygames-bench-')
+    env = dict(os.environ, HOME=home, APPDATA=home)
+    try:
+        # Warm the OS file cache so the first measured run is not an outlier
+        time_startup(True, env)
+        eager = [time_startup(True, env) for _ in range(args.runs)]
+        lazy = [time_startup(False, env) for _ in range(args.runs)]
+    except subprocess.CalledProcessError as e:
+        print(f"Error starting the application: {e.stderr.strip().splitlines()[-1]}")
+        return 1
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+    eager_ms = statistics.median(eager)
+    lazy_ms = statistics.median(lazy)
+    print(f"runs per variant:   {args.runs}")
+    print(f"eager, median:      {eager_ms:.1f} ms")
+    print(f"lazy, median:       {lazy_ms:.1f} ms")
+    print(f"saved:              {eager_ms - lazy_ms:.1f} ms "
+          f"({(eager_ms - lazy_ms) / eager_ms:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
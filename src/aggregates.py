@@ -0,0 +1,104 @@
+"""Running per-game statistics maintained one finished game at a time."""
+import math
+import time
+from datetime import date
+
+
+TREND_ALPHA = 0.3
+
+
+class RunningStats:
+    """
+    Statistics over the final scores of a game, updated in O(1).
+
+    Mean and variance use Welford's algorithm. The recent trend is the
+    difference between an exponentially weighted mean of recent scores and
+    the overall mean. The streak counts consecutive calendar days with at
+    least one finished game.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'best', 'recent', 'streak', 'last_day')
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, best=0, recent=0.0, streak=0, last_day=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.best = best
+        self.recent = recent
+        self.streak = streak
+        self.last_day = last_day
+
+    def add(self, score, timestamp=None):
+        """
+        Fold a finished game's score into the statistics.
+
+        Args:
+            score: Final score of the game
+            timestamp: Unix time the game finished (defaults to now)
+        """
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+        self.best = max(self.best, score)
+        self.recent = score if self.count == 1 else (
+            TREND_ALPHA * score + (1 - TREND_ALPHA) * self.recent
+        )
+
+        if timestamp is None:
+            timestamp = time.time()
+        day = date.fromtimestamp(timestamp).toordinal()
+        if self.last_day is None or day > self.last_day + 1:
+            self.streak = 1
+        elif day == self.last_day + 1:
+            self.streak += 1
+        self.last_day = day if self.last_day is None else max(day, self.last_day)
+
+    @property
+    def variance(self):
+        """Sample variance of the scores."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        """Sample standard deviation of the scores."""
+        return math.sqrt(self.variance)
+
+    @property
+    def trend(self):
+        """Recent weighted mean minus overall mean; positive means improving."""
+        return self.recent - self.mean if self.count > 1 else 0.0
+
+    def to_dict(self):
+        """Return a JSON-serializable copy of the state."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild statistics saved with to_dict()."""
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def copy(self):
+        """Return an independent copy."""
+        return RunningStats.from_dict(self.to_dict())
+
+
+def apply_game_record(aggregates, record):
+    """
+    Fold a log record into a dictionary of per-game RunningStats.
+
+    Only 'game' records (one per finished game) and resets affect the
+    aggregates.
+
+    Args:
+        aggregates: Dictionary mapping game name to RunningStats, updated in place
+        record: Log record dictionary
+    """
+    kind = record.get('k')
+    if kind == 'reset':
+        aggregates.clear()
+    elif kind == 'game':
+        stats = aggregates.get(record['g'])
+        if stats is None:
+            stats = aggregates[record['g']] = RunningStats()
+        stats.add(record['score'], record.get('t'))
@@ -0,0 +1,293 @@
+"""
+Psychometric analytics over stored trial history.
+
+Requires NumPy. Every computation works on a whole cohort at once: trials
+are loaded into flat arrays, grouped with bincount and fitted with a
+batched Newton solver, so there is no Python loop per participant.
+"""
+from array import array
+import numpy as np
+from utils import iter_profiles, iter_profile_records
+
+
+# Spatial Memory games on other grid sizes are recorded under names of
+# their own ("Spatial Memory Game 5x5") and are analysed as separate games
+GAME_NAMES = ('Spatial Memory Game', 'Corsi Block Test', 'Memory Span')
+
+
+class TrialTable:
+    """
+    Trials of a cohort as parallel NumPy columns.
+
+    Attributes:
+        profiles: Profile names; participant column values index into it
+        game_names: Game names; game column values index into it
+        participant: Participant index of each trial
+        game: Index into game_names of each trial
+        length: Sequence length (the level) of each trial
+        passed: 1 if the trial was cleared, 0 if not
+        error_position: Position of the first wrong response, -1 if none
+    """
+
+    def __init__(self, profiles, game_names, participant, game, length, passed, error_position):
+        self.profiles = profiles
+        self.game_names = game_names
+        self.participant = participant
+        self.game = game
+        self.length = length
+        self.passed = passed
+        self.error_position = error_position
+
+    def __len__(self):
+        return len(self.length)
+
+    def select(self, game_name):
+        """Return a table with only the trials of one game."""
+        mask = self.game == self.game_names.index(game_name)
+        return TrialTable(self.profiles, self.game_names, self.participant[mask], self.game[mask],
+                          self.length[mask], self.passed[mask], self.error_position[mask])
+
+
+def _first_error(sequence, responses):
+    """Return the position of the first wrong response, or -1."""
+    for position, (expected, given) in enumerate(zip(sequence, responses)):
+        if expected != given:
+            return position
+    return -1
+
+
+def load_trials(profile_names=None, game_name=None, since=None, until=None,
+                include_invalid=False):
+    """
+    Load the trials of a cohort from storage.
+
+    Records are streamed into typed arrays, so loading costs a few bytes
+    per trial on top of the final NumPy columns. Trials whose stimuli
+    missed their presentation deadlines are left out unless asked for.
+
+    Args:
+        profile_names: Profiles to load; all profiles if None
+        game_name: Only load trials of this game
+        since: Only load trials at or after this Unix timestamp
+        until: Only load trials before this Unix timestamp
+        include_invalid: Also load trials flagged as invalid
+
+    Returns:
+        TrialTable
+    """
+    profiles = []
+    participant, game, length = array('i'), array('b'), array('h')
+    passed, error_position = array('b'), array('h')
+    game_names = list(GAME_NAMES)
+    game_codes = {name: code for code, name in enumerate(game_names)}
+
+    for profile in iter_profiles(profile_names):
+        index = len(profiles)
+        profiles.append(profile.name)
+        for record in iter_profile_records(profile, since, until, game_name):
+            if record['k'] != 'trial':
+                continue
+            if not include_invalid and not record.get('valid', 1):
+                continue
+            if record['g'] not in game_codes:
+                game_codes[record['g']] = len(game_names)
+                game_names.append(record['g'])
+            participant.append(index)
+            game.append(game_codes[record['g']])
+            length.append(record['lv'])
+            passed.append(1 if record['ok'] else 0)
+            error_position.append(
+                -1 if record['ok'] else _first_error(record.get('seq', ()), record.get('resp', ()))
+            )
+
+    return TrialTable(
+        profiles,
+        game_names,
+        np.frombuffer(participant, dtype=np.int32),
+        np.frombuffer(game, dtype=np.int8),
+        np.frombuffer(length, dtype=np.int16).astype(np.int64),
+        np.frombuffer(passed, dtype=np.int8).astype(np.int64),
+        np.frombuffer(error_position, dtype=np.int16).astype(np.int64)
+    )
+
+
+def _grouped_counts(participant, key, weights, participants, width):
+    """Sum weights into a participants x width matrix in one bincount."""
+    flat = participant.astype(np.int64) * width + key
+    return np.bincount(flat, weights=weights, minlength=participants * width).reshape(
+        participants, width
+    )
+
+
+def accuracy_by_length(table):
+    """
+    Compute each participant's accuracy at every sequence length.
+
+    Args:
+        table: TrialTable of a single game
+
+    Returns:
+        (lengths, accuracy, trials): lengths is 1..max length; accuracy and
+        trials are participants x lengths matrices, accuracy is NaN where a
+        length was never attempted
+    """
+    participants = len(table.profiles)
+    width = int(table.length.max()) + 1 if len(table) else 1
+    trials = _grouped_counts(table.participant, table.length, None, participants, width)
+    passes = _grouped_counts(table.participant, table.length, table.passed, participants, width)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        accuracy = passes / trials
+    return np.arange(1, width), accuracy[:, 1:], trials[:, 1:]
+
+
+def span_estimates(table):
+    """
+    Estimate each participant's memory span.
+
+    Args:
+        table: TrialTable of a single game
+
+    Returns:
+        Dictionary of per-participant arrays:
+            'max_span': longest sequence ever cleared
+            'mean_span': sum of accuracy over lengths, counting lengths below
+                the shortest attempted as cleared and above the longest
+                attempted as failed (a partial-credit span)
+            'trials': number of trials
+    """
+    participants = len(table.profiles)
+    max_span = np.zeros(participants, dtype=np.int64)
+    np.maximum.at(max_span, table.participant, table.length * table.passed)
+
+    _, accuracy, trials = accuracy_by_length(table)
+    attempted = trials > 0
+    columns = np.arange(accuracy.shape[1])
+    first = np.where(attempted.any(axis=1), attempted.argmax(axis=1), accuracy.shape[1])
+    filled = np.where(attempted, accuracy, 0.0)
+    filled = np.where(columns[None, :] < first[:, None], 1.0, filled)
+    mean_span = np.where(attempted.any(axis=1), filled.sum(axis=1), 0.0)
+
+    return {
+        'max_span': max_span,
+        'mean_span': mean_span,
+        'trials': np.bincount(table.participant, minlength=participants)
+    }
+
+
+def position_error_curves(table):
+    """
+    Compute the error rate at each position of the sequence.
+
+    The rate at a position is the number of first errors made there divided
+    by the number of trials in which the player got that far.
+
+    Args:
+        table: TrialTable of a single game
+
+    Returns:
+        (positions, error_rate): positions start at 0; error_rate is a
+        participants x positions matrix, NaN where no trial reached it
+    """
+    participants = len(table.profiles)
+    width = int(table.length.max()) if len(table) else 1
+
+    failed = table.error_position >= 0
+    errors = _grouped_counts(
+        table.participant[failed], table.error_position[failed], None, participants, width
+    )
+
+    # A trial reaches every position up to its first error, or all of them
+    reached_until = np.where(failed, table.error_position + 1, table.length)
+    ends = _grouped_counts(table.participant, reached_until - 1, None, participants, width)
+    reached = ends[:, ::-1].cumsum(axis=1)[:, ::-1]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        error_rate = errors / reached
+    return np.arange(width), error_rate
+
+
+def fit_psychometric(table, iterations=50, ridge=0.01):
+    """
+    Fit a logistic psychometric curve p(pass | length) per participant.
+
+    The model is logit(p) = a + b * length, fitted by batched Newton steps
+    on all participants at once. A small ridge penalty keeps the estimates
+    finite for perfectly separated data (clearing every length up to k and
+    failing k + 1), which is the usual shape of a staircase session.
+
+    Args:
+        table: TrialTable of a single game
+        iterations: Newton iterations
+        ridge: L2 penalty on both coefficients
+
+    Returns:
+        Dictionary of per-participant arrays:
+            'threshold': length at which p = 0.5 (a span estimate)
+            'slope': logistic slope b (negative when longer is harder)
+            'intercept': intercept a
+            'n': number of trials
+    """
+    lengths, accuracy, trials = accuracy_by_length(table)
+    passes = np.nan_to_num(accuracy) * trials
+    x = lengths.astype(float)[None, :]
+    participants = trials.shape[0]
+
+    # Centre lengths to keep the Newton system well conditioned
+    centre = (trials * x).sum(axis=1) / np.maximum(trials.sum(axis=1), 1)
+    xc = x - centre[:, None]
+    a = np.zeros(participants)
+    b = np.zeros(participants)
+
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(a[:, None] + b[:, None] * xc)))
+        residual = passes - trials * p
+        w = trials * p * (1.0 - p)
+
+        grad_a = residual.sum(axis=1) - ridge * a
+        grad_b = (residual * xc).sum(axis=1) - ridge * b
+        h_aa = w.sum(axis=1) + ridge
+        h_ab = (w * xc).sum(axis=1)
+        h_bb = (w * xc * xc).sum(axis=1) + ridge
+
+        det = h_aa * h_bb - h_ab * h_ab
+        a = a + (h_bb * grad_a - h_ab * grad_b) / det
+        b = b + (h_aa * grad_b - h_ab * grad_a) / det
+
+    intercept = a - b * centre
+    with np.errstate(invalid='ignore', divide='ignore'):
+        threshold = np.where(b != 0, -intercept / b, np.nan)
+
+    return {
+        'threshold': threshold,
+        'slope': b,
+        'intercept': intercept,
+        'n': trials.sum(axis=1)
+    }
+
+
+def summarize(table):
+    """
+    Run every analysis for each game present in a table.
+
+    Returns:
+        Dictionary mapping game name to a dictionary with the span
+        estimates, accuracy by length, position error curves and
+        psychometric fit of that game
+    """
+    results = {}
+    for code, game_name in enumerate(table.game_names):
+        if not np.any(table.game == code):
+            continue
+        game_table = table.select(game_name)
+        lengths, accuracy, trials = accuracy_by_length(game_table)
+        positions, error_rate = position_error_curves(game_table)
+        results[game_name] = {
+            'span': span_estimates(game_table),
+            'lengths': lengths,
+            'accuracy': accuracy,
+            'trials': trials,
+            'positions': positions,
+            'error_rate': error_rate,
+            'fit': fit_psychometric(game_table)
+        }
+    return results
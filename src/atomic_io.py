@@ -0,0 +1,58 @@
+"""Crash-safe file writing helpers."""
+import os
+import json
+import tempfile
+
+
+def fsync_directory(folder):
+    """Flush a directory entry to disk so a rename inside it is durable."""
+    if os.name != 'posix':
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path, data):
+    """
+    Replace a file with new contents so readers see either the old or the
+    new version, never a truncated one.
+
+    The data goes to a temporary file in the same directory, is fsynced and
+    then renamed over the target.
+
+    Args:
+        path: Destination file
+        data: Bytes to write
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    fsync_directory(folder)
+
+
+def atomic_write_json(path, obj):
+    """Atomically replace a file with the JSON encoding of obj."""
+    atomic_write_bytes(path, json.dumps(obj, ensure_ascii=False).encode('utf-8'))
+
+
+def read_json(path, default=None):
+    """Read a JSON file, returning default if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
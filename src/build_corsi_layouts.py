@@ -0,0 +1,46 @@
+"""
+Build the library of precomputed Corsi board layouts.
+
+Examples:
+    python build_corsi_layouts.py
+    python build_corsi_layouts.py --layouts 1024 --seed 7 layouts.bin
+"""
+import sys
+import argparse
+from utils import get_asset_path
+from games.corsi_layouts import generate_layouts, write_library
+
+
+def main(argv=None):
+    """Run the layout library generator"""
+    parser = argparse.ArgumentParser(
+        description="Precompute validated Corsi block layouts into a binary library."
+    )
+    parser.add_argument('output', nargs='?', default=get_asset_path('corsi_layouts.bin'),
+                        help="library file to write (default: the shipped assets/corsi_layouts.bin)")
+    parser.add_argument('--layouts', type=int, default=256,
+                        help="number of layouts including the reference board (default: 256)")
+    parser.add_argument('--blocks', type=int, default=12,
+                        help="blocks per generated layout (default: 12)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="random seed; the same seed rebuilds the same library (default: 0)")
+    args = parser.parse_args(argv)
+
+    try:
+        layouts = generate_layouts(args.layouts, args.blocks, args.seed)
+        write_library(args.output, layouts)
+    except (OSError, ValueError) as e:
+        print(f"Error building layouts: {e}", file=sys.stderr)
+        return 1
+
+    spreads = [layout.spread for layout in layouts[1:]]
+    paths = [layout.path_length for layout in layouts[1:]]
+    print(f"Wrote {len(layouts)} layouts to {args.output}")
+    if spreads:
+        print(f"  spread {min(spreads):.0f}-{max(spreads):.0f}px, "
+              f"path length {min(paths):.0f}-{max(paths):.0f}px")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Export recorded sessions, trials and games for analysis.
+
+Examples:
+    python export.py trials.csv.gz
+    python export.py - --kind sessions --format ndjson --profile Alice
+    python export.py games.csv --kind games
+    python export.py span.ndjson.xz --game "Memory Span" --since 2026-01-01
+"""
+import sys
+import argparse
+from datetime import datetime
+from exporter import export, FORMATS, COMPRESSIONS, KINDS
+
+
+def _parse_date(value):
+    """Parse an ISO date or date-time (local time) into a Unix timestamp."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r}")
+
+
+def _guess_options(path, fmt, compression):
+    """Fill in format and compression from the output file name."""
+    name = path.lower()
+    if compression is None:
+        if name.endswith('.gz'):
+            compression = 'gzip'
+        elif name.endswith('.xz'):
+            compression = 'xz'
+        else:
+            compression = 'none'
+    if fmt is None:
+        stem = name.rsplit('.', 1)[0] if compression != 'none' else name
+        fmt = 'ndjson' if stem.endswith(('.ndjson', '.jsonl')) else 'csv'
+    return fmt, compression
+
+
+def main(argv=None):
+    """Run the export command line tool"""
+    parser = argparse.ArgumentParser(
+        description="Export Memory Games sessions, trials and games.",
+        epilog=__doc__.split('\n\n', 1)[1],
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('output', help="output file, or '-' for standard output")
+    parser.add_argument('--kind', choices=tuple(KINDS), default='trials')
+    parser.add_argument('--format', dest='fmt', choices=FORMATS,
+                        help="default: from the file name, otherwise csv")
+    parser.add_argument('--compression', choices=COMPRESSIONS,
+                        help="default: from the file name (.gz, .xz)")
+    parser.add_argument('--profile', action='append', dest='profiles',
+                        help="profile to export (repeatable); default: all")
+    parser.add_argument('--game', help="only export this game, e.g. 'Memory Span'")
+    parser.add_argument('--since', type=_parse_date, help="start date (inclusive)")
+    parser.add_argument('--until', type=_parse_date, help="end date (exclusive)")
+    args = parser.parse_args(argv)
+
+    fmt, compression = _guess_options(args.output, args.fmt, args.compression)
+    try:
+        count = export(args.output, fmt, args.kind, compression, args.profiles,
+                       args.since, args.until, args.game)
+    except (OSError, ValueError) as e:
+        print(f"Error exporting records: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Exported {count} {args.kind}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
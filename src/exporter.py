@@ -0,0 +1,180 @@
+"""Streaming export of recorded sessions, trials and games to CSV or NDJSON."""
+import io
+import csv
+import sys
+import json
+import gzip
+import lzma
+from datetime import datetime
+from utils import iter_profiles, iter_profile_records
+
+
+TRIAL_FIELDS = ('profile', 'session', 'game', 'level', 'passed', 'valid', 'timestamp',
+                'sequence', 'responses', 'response_times_ms', 'intervals_ms', 'event_times_ms')
+SESSION_FIELDS = ('profile', 'session', 'game', 'started', 'layout', 'grid_size')
+GAME_FIELDS = ('profile', 'session', 'game', 'score', 'finished', 'stimuli', 'misses',
+               'miss_rate', 'mean_dev_ms', 'max_dev_ms')
+KINDS = {'trials': 'trial', 'sessions': 'session', 'games': 'game'}
+FIELDS = {'trials': TRIAL_FIELDS, 'sessions': SESSION_FIELDS, 'games': GAME_FIELDS}
+FORMATS = ('csv', 'ndjson')
+COMPRESSIONS = ('none', 'gzip', 'xz')
+
+
+def _format_time(timestamp):
+    """Format a Unix timestamp as local ISO 8601 with milliseconds."""
+    return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec='milliseconds')
+
+
+def iter_rows(kind='trials', profile_names=None, since=None, until=None, game_name=None):
+    """
+    Yield export rows one at a time.
+
+    Args:
+        kind: 'trials', 'sessions' or 'games'
+        profile_names: Profiles to export; all profiles if None
+        since: Only include rows at or after this Unix timestamp
+        until: Only include rows before this Unix timestamp
+        game_name: Only include rows of this game
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown export kind: {kind}")
+    wanted = KINDS[kind]
+
+    for profile in iter_profiles(profile_names):
+        for record in iter_profile_records(profile, since, until, game_name):
+            if record['k'] != wanted:
+                continue
+            if wanted == 'session':
+                yield {
+                    'profile': profile.name,
+                    'session': record['s'],
+                    'game': record['g'],
+                    'started': _format_time(record['t']),
+                    'layout': record.get('layout', ''),
+                    'grid_size': record.get('grid', '')
+                }
+            elif wanted == 'game':
+                # Deadline-miss statistics of the stimuli; empty for games
+                # recorded before they were measured
+                qa = record.get('qa', {})
+                yield {
+                    'profile': profile.name,
+                    'session': record.get('s', ''),
+                    'game': record['g'],
+                    'score': record['score'],
+                    'finished': _format_time(record['t']),
+                    'stimuli': qa.get('stimuli', ''),
+                    'misses': qa.get('misses', ''),
+                    'miss_rate': qa.get('miss_rate', ''),
+                    'mean_dev_ms': qa.get('mean_dev_ms', ''),
+                    'max_dev_ms': qa.get('max_dev_ms', '')
+                }
+            else:
+                yield {
+                    'profile': profile.name,
+                    'session': record.get('s', ''),
+                    'game': record['g'],
+                    'level': record['lv'],
+                    'passed': record['ok'],
+                    'valid': record.get('valid', 1),
+                    'timestamp': _format_time(record['t']),
+                    'sequence': record.get('seq', []),
+                    'responses': record.get('resp', []),
+                    'response_times_ms': record.get('rt', []),
+                    'intervals_ms': record.get('iri', []),
+                    'event_times_ms': record.get('ev', [])
+                }
+
+
+def write_csv(rows, stream, fields):
+    """
+    Write rows as CSV, list values joined with spaces.
+
+    Returns:
+        Number of rows written
+    """
+    writer = csv.writer(stream)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow([
+            ' '.join(map(str, value)) if isinstance(value, list) else value
+            for value in (row[field] for field in fields)
+        ])
+        count += 1
+    return count
+
+
+def write_ndjson(rows, stream):
+    """
+    Write rows as newline-delimited JSON.
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(row, ensure_ascii=False))
+        stream.write('\n')
+        count += 1
+    return count
+
+
+def open_output(path, compression='none'):
+    """
+    Open a text stream for export output.
+
+    Args:
+        path: Output file, or '-' for standard output
+        compression: 'none', 'gzip' or 'xz'
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+
+    if path == '-':
+        if compression == 'none':
+            return io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', newline='',
+                                    write_through=True)
+        raw = sys.stdout.buffer
+        if compression == 'gzip':
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode='wb'),
+                                    encoding='utf-8', newline='')
+        return io.TextIOWrapper(lzma.LZMAFile(raw, mode='wb'), encoding='utf-8', newline='')
+
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    if compression == 'xz':
+        return lzma.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def export(path, fmt='csv', kind='trials', compression='none', profile_names=None,
+           since=None, until=None, game_name=None):
+    """
+    Export sessions, trials or games to a file.
+
+    Rows are streamed from storage to the (optionally compressed) output,
+    so memory use stays flat however long the history is.
+
+    Returns:
+        Number of rows written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    if profile_names is not None:
+        # Resolve names up front so an unknown profile fails before any output
+        list(iter_profiles(profile_names))
+
+    rows = iter_rows(kind, profile_names, since, until, game_name)
+    stream = open_output(path, compression)
+    try:
+        if fmt == 'csv':
+            return write_csv(rows, stream, FIELDS[kind])
+        return write_ndjson(rows, stream)
+    finally:
+        if path == '-' and compression == 'none':
+            stream.flush()
+            stream.detach()
+        else:
+            stream.close()
@@ -1,6 +1,19 @@
 """Games package - contains all memory game implementations"""
-from .spatial_memory_game import SpatialMemoryGame
-from .corsi_block_test import CorsiBlockTest
-from .memory_span_game import MemorySpanGame
 
 __all__ = ['SpatialMemoryGame', 'CorsiBlockTest', 'MemorySpanGame']
+
+
+def __getattr__(name):
+    # Game classes are imported on first use, so the toolkit-free modules
+    # of the package (placement, layouts, timelines) import without it.
+    # Plain import statements keep the modules visible to PyInstaller.
+    if name == 'SpatialMemoryGame':
+        from .spatial_memory_game import SpatialMemoryGame
+        return SpatialMemoryGame
+    if name == 'CorsiBlockTest':
+        from .corsi_block_test import CorsiBlockTest
+        return CorsiBlockTest
+    if name == 'MemorySpanGame':
+        from .memory_span_game import MemorySpanGame
+        return MemorySpanGame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,55 @@
 """Base game class for all memory games."""
 import customtkinter as ctk
+from time import perf_counter_ns
+from trial_buffer import TrialBuffer, MISSING
+from utils import load_records, update_record, log_trial, start_session, record_game
+from screens import show_screen
+from styles import font, resolve_color
+from .timeline import Timeline
+from .presentation_qa import PresentationMonitor, DEFAULT_TOLERANCE_MS
+from .timers import TimerRegistry
+from .state_machine import StateMachine
+from .engine import SequenceEngine, FAILED, PASSED, GAP_MS
+
+
+IDLE = 'idle'
+COUNTDOWN = 'countdown'
+SHOWING = 'showing'
+RESPONDING = 'responding'
+LEVEL_COMPLETE = 'level_complete'
+GAME_OVER = 'game_over'
 
 
 class BaseGame:
-    """Base class for all memory games."""
+    """
+    Base class for all memory games.
+    
+    The rules of a game (sequence growth, judging responses, scoring)
+    live in a toolkit-free engine from games.engine; this class is its
+    view. The flow of a game (countdown, presentation, responses, level
+    transitions, game over) is a state machine defined by TRANSITIONS and
+    shared by every game. Subclasses only build their board and say how a
+    stimulus is shown and highlighted.
+    
+    A game's screen is built the first time it is started and kept alive
+    afterwards; starting again only resets the game state and the view.
+    """
+    
+    GAME_NAME = None
+    STIMULUS_COUNT = 9
+    RESPOND_PROMPT = "Repeat the sequence!"
+    PRESENTATION_TOLERANCE_MS = DEFAULT_TOLERANCE_MS
+    
+    # (state, event, next state, action)
+    TRANSITIONS = (
+        (IDLE, 'start', COUNTDOWN, '_on_start'),
+        (COUNTDOWN, 'countdown_done', SHOWING, '_on_begin_level'),
+        (SHOWING, 'presented', RESPONDING, '_on_presented'),
+        (RESPONDING, 'respond', RESPONDING, '_on_respond'),
+        (RESPONDING, 'pass', LEVEL_COMPLETE, '_on_pass'),
+        (RESPONDING, 'fail', GAME_OVER, '_on_fail'),
+        (LEVEL_COMPLETE, 'next_level', SHOWING, '_on_begin_level'),
+    )
     
     def __init__(self, app, on_back):
         """
@@ -14,18 +60,428 @@ class BaseGame:
             on_back: Callback function to return to main menu
         """
         self.app = app
-        self.on_back = on_back
-        self.sequence = []
-        self.user_sequence = []
-        self.level = 1
-        self.is_playing = False
-        self.is_showing = False
-        self.game_started = False
+        self._on_back = on_back
+        self.timers = TimerRegistry(app)
+        self.engine = self.create_engine()
+        self.board_colors = {}
+        self.board_cost = {'batches': 0, 'changes': 0, 'skipped': 0, 'draw_ns': 0}
+        self.screen = None
+        self.game_over_overlay = None
+        self._on_restart = None
+        self.machine = StateMachine(self.TRANSITIONS, IDLE, self)
+        self.trials = TrialBuffer()
+        self._level_first_row = 0
+        self.timeline = None
+        self.presentation = PresentationMonitor(self.PRESENTATION_TOLERANCE_MS)
+        self._level_valid = True
+        self._response_start_ns = 0
+        self._last_response_ns = 0
+    
+    @property
+    def state(self):
+        """Current state of the game flow."""
+        return self.machine.state
+    
+    @property
+    def stimulus_count(self):
+        """Number of distinct stimuli a sequence is drawn from."""
+        return self.engine.stimulus_count
+    
+    @property
+    def sequence(self):
+        """Sequence of the current level."""
+        return self.engine.sequence
+    
+    @property
+    def user_sequence(self):
+        """Responses given so far in the current level."""
+        return self.engine.responses
+    
+    @property
+    def level(self):
+        """Current level, starting at 1."""
+        return self.engine.level
+    
+    @property
+    def record_name(self):
+        """Name the game's sessions, trials, bests and statistics are recorded under."""
+        return self.GAME_NAME
+    
+    def create_engine(self):
+        """Create the engine holding the rules of the game."""
+        return SequenceEngine(self.STIMULUS_COUNT)
+    
+    def fire(self, event, *args):
+        """Dispatch a game flow event; returns False if the current state rejects it."""
+        return self.machine.fire(event, *args)
+    
+    def start(self):
+        """Show the game's screen, ready to start a new game at level 1."""
+        self.cancel_timers()
+        
+        if self.screen is None:
+            self.screen = ctk.CTkFrame(self.app, fg_color="transparent", corner_radius=0)
+            self.build_screen()
+        show_screen(self.app, self.screen)
+        
+        self.engine.reset()
+        self.machine.reset()
+        self.reset_trials()
+        self.reset_view()
+    
+    def session_details(self):
+        """Keyword arguments for utils.start_session describing the new session."""
+        return {}
+    
+    def build_screen(self):
+        """Create the game's widgets inside self.screen. Must be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement build_screen()")
+    
+    def reset_view(self):
+        """Return the widgets of the screen to their state at the start of a game."""
+        self.hide_help_tooltip()
+        if self.game_over_overlay is not None:
+            self.game_over_overlay.place_forget()
+        self.level_label.configure(text=f"Level: {self.level}")
+        self.header.configure(text="Press 'Start' to begin")
+        self.paint_board("gray85")
+        self.start_btn.place(in_=self.start_spacer, relx=0.5, rely=0.5, anchor="center")
+    
+    def respond(self, stimulus, response_ns=None, event_ms=MISSING):
+        """
+        Handle the player choosing a stimulus; ignored unless a response is expected.
+        
+        Args:
+            stimulus: The chosen stimulus
+            response_ns: perf_counter_ns() of the press that chose it; now
+                if None, for widgets that respond on the press itself
+            event_ms: Tk event time of the press, if known
+        """
+        if response_ns is None:
+            response_ns = perf_counter_ns()
+        self.fire('respond', stimulus, response_ns, event_ms)
+    
+    def _on_start(self):
+        """Open the session, hide the start button and count down to the first level."""
+        # Settings such as the grid size are fixed from here on, so the
+        # session describes the game that is actually played
+        start_session(self.record_name, **self.session_details())
+        self.start_btn.place_forget()
+        
+        def countdown(count):
+            if count > 0:
+                self.header.configure(text=f"{count}")
+                self.after(1000, lambda: countdown(count - 1))
+            else:
+                self.fire('countdown_done')
+        
+        countdown(3)
+    
+    def _on_begin_level(self):
+        """Extend the sequence by one stimulus and present it."""
+        self.engine.step()
+        self.header.configure(text="Watch the sequence...")
+        
+        self.present_sequence(
+            lambda index: self.present_stimulus(self.sequence[index]),
+            lambda index: self.withdraw_stimulus(self.sequence[index]),
+            lambda: self.fire('presented')
+        )
+    
+    def _on_presented(self):
+        """Ask the player to repeat the sequence."""
+        self.header.configure(text=self.RESPOND_PROMPT)
+    
+    def _on_respond(self, stimulus, response_ns, event_ms):
+        """Record a response and decide whether the level is passed, failed or goes on."""
+        position = len(self.user_sequence)
+        result = self.engine.respond(stimulus)
+        self.record_response(position, stimulus, result != FAILED, response_ns, event_ms)
+        
+        self.highlight_stimulus(stimulus, "#1f6aa5")
+        
+        if result == FAILED:
+            self.fire('fail')
+        elif result == PASSED:
+            self.fire('pass')
+        else:
+            self.after(300, lambda: self.reset_stimulus(stimulus))
+    
+    def _on_pass(self):
+        """Let the last response show before completing the level."""
+        self.after(300, self._level_complete)
+    
+    def _on_fail(self):
+        """Let the wrong response show before ending the game."""
+        self.after(300, self._game_over)
+    
+    def _level_complete(self):
+        """Record the cleared level and move on to the next one."""
+        self.paint_board("gray85")
+        
+        self.engine.complete_level()
+        records = load_records()
+        update_record(records, self.record_name, self.engine.score, **self.trial_details())
+        self.level_label.configure(text=f"Level: {self.level}")
+        self.header.configure(text="Great! Next level...")
+        self.on_level_cleared()
+        
+        self.after(1500, lambda: self.fire('next_level'))
+    
+    def _game_over(self):
+        """Record the failed level and the finished game."""
+        log_trial(self.record_name, self.level, False, **self.trial_details())
+        record_game(self.record_name, self.engine.score, self.presentation.summary())
+        
+        self.paint_board("#8b0000")
+        
+        self.after(500, self._show_game_over_screen)
+    
+    def _show_game_over_screen(self):
+        """Show the final score and offer a new game."""
+        self.paint_board("gray85")
+        self.header.configure(text="Game Over!")
+        self.show_game_over_modal(self.GAME_NAME, self.engine.score, self.start)
+    
+    def present_stimulus(self, stimulus):
+        """Show a stimulus of the sequence; highlights it by default."""
+        self.highlight_stimulus(stimulus, "#4a9eff")
+    
+    def withdraw_stimulus(self, stimulus):
+        """Hide a stimulus of the sequence; resets its highlight by default."""
+        self.reset_stimulus(stimulus)
+    
+    def on_level_cleared(self):
+        """Called after a level is recorded, before the next one starts."""
+    
+    def resolve_color(self, color):
+        """Return a colour name as #rrggbb, resolving each name only once."""
+        return resolve_color(self.app, color)
+    
+    def set_board_colors(self, changes):
+        """
+        Apply colour changes to the stimulus widgets as one batch.
+        
+        Stimuli already showing their target colour are skipped, and the
+        rest are handed to draw_stimuli() together, with colours resolved
+        ahead of time. The number of batches, changes, skipped widgets and
+        drawing time are accumulated in self.board_cost.
+        
+        Args:
+            changes: Iterable of (stimulus, colour)
+            
+        Returns:
+            Number of widgets changed
+        """
+        colors = self.board_colors
+        cost = self.board_cost
+        pending = []
+        for stimulus, color in changes:
+            color = self.resolve_color(color)
+            if colors.get(stimulus) == color:
+                cost['skipped'] += 1
+            else:
+                colors[stimulus] = color
+                pending.append((stimulus, color))
+        if not pending:
+            return 0
+        
+        started = perf_counter_ns()
+        self.draw_stimuli(pending)
+        cost['batches'] += 1
+        cost['changes'] += len(pending)
+        cost['draw_ns'] += perf_counter_ns() - started
+        return len(pending)
+    
+    def forget_board_colors(self):
+        """Forget the tracked colours after the stimulus widgets were recreated."""
+        self.board_colors = {}
+    
+    def draw_stimuli(self, changes):
+        """
+        Recolour stimulus widgets. Must be implemented by subclasses.
+        
+        Args:
+            changes: List of (stimulus, resolved colour) that differ from
+                what is shown
+        """
+        raise NotImplementedError("Subclasses must implement draw_stimuli()")
+    
+    def highlight_stimulus(self, stimulus, color):
+        """Colour the widget of a stimulus."""
+        self.set_board_colors(((stimulus, color),))
+    
+    def reset_stimulus(self, stimulus):
+        """Return the widget of a stimulus to its default colour."""
+        self.highlight_stimulus(stimulus, "gray85")
+    
+    def paint_board(self, color):
+        """Colour every stimulus widget in one batch."""
+        self.set_board_colors((stimulus, color) for stimulus in range(self.stimulus_count))
+    
+    def after(self, ms, callback):
+        """Schedule a callback that is dropped when the game is left or restarted."""
+        return self.timers.after(ms, callback)
+    
+    def cancel_timers(self):
+        """Cancel the sequence presentation and every pending callback."""
+        if self.timeline is not None:
+            self.timeline.cancel()
+            self.timeline = None
+        self.timers.cancel_all()
+    
+    def on_back(self):
+        """Leave the game, dropping its pending callbacks, and return to the menu."""
+        self.cancel_timers()
+        self._on_back()
+    
+    def reset_trials(self):
+        """Start a fresh trial buffer and presentation statistics for a new session."""
+        self.trials = TrialBuffer()
+        self._level_first_row = 0
+        self.presentation.reset()
+    
+    def record_stimulus_onset(self, position, stimulus, scheduled_ns=MISSING):
+        """Record that the stimulus at a sequence position was shown."""
+        if position == 0:
+            self._level_first_row = len(self.trials)
+        self.trials.append(self.level, stimulus, onset_ns=perf_counter_ns(),
+                           scheduled_onset_ns=scheduled_ns)
+    
+    def record_stimulus_offset(self, position, scheduled_ns=MISSING, intended_ns=None):
+        """
+        Record that the stimulus at a sequence position was hidden.
+        
+        If the intended on-screen duration is given, the measured one is
+        checked against it; a miss marks the stimulus and its level invalid.
+        """
+        row = self._level_first_row + position
+        if row >= len(self.trials):
+            return
+        offset_ns = perf_counter_ns()
+        self.trials.set(row, 'offset_ns', offset_ns)
+        self.trials.set(row, 'scheduled_offset_ns', scheduled_ns)
+        if intended_ns is not None:
+            valid = self.presentation.check(self.trials.get(row, 'onset_ns'), offset_ns, intended_ns)
+            self.trials.set(row, 'valid', 1 if valid else 0)
+            if not valid:
+                self._level_valid = False
+    
+    def present_sequence(self, on_show, on_hide, on_done):
+        """
+        Present self.sequence on a drift-compensated timeline.
+        
+        Each item is visible for the engine's presentation time followed by
+        a GAP_MS gap. Every onset and offset is dispatched against an absolute
+        deadline and recorded in the trial buffer with its scheduled time.
+        
+        Onsets and offsets are timestamped after update_idletasks() has
+        flushed the redraw, so the difference is the real on-screen
+        duration; stimuli off by more than PRESENTATION_TOLERANCE_MS make
+        the level invalid.
+        
+        Args:
+            on_show: Called with the sequence position to show
+            on_hide: Called with the sequence position to hide
+            on_done: Called when the whole sequence has been shown
+        """
+        delay = self.engine.presentation_ms()
+        
+        intended_ns = delay * 1_000_000
+        
+        def show(index):
+            on_show(index)
+            self.app.update_idletasks()
+            self.record_stimulus_onset(index, self.sequence[index],
+                                       self.timeline.scheduled_ns[2 * index])
+        
+        def hide(index):
+            on_hide(index)
+            self.app.update_idletasks()
+            self.record_stimulus_offset(index, self.timeline.scheduled_ns[2 * index + 1],
+                                        intended_ns)
+        
+        def done():
+            self._response_start_ns = self._last_response_ns = perf_counter_ns()
+            on_done()
+        
+        self._level_valid = True
+        if self.timeline is not None:
+            self.timeline.cancel()
+        self.timeline = Timeline.for_sequence(
+            self.timers, len(self.sequence), delay, GAP_MS, show, hide, done
+        )
+        self.timeline.start()
+    
+    def record_response(self, position, response, correct, response_ns, event_ms=MISSING):
+        """
+        Record the player's response at a sequence position.
+        
+        Reaction time is measured from the end of the presentation, the
+        inter-response interval from the previous response.
+        
+        Args:
+            position: Sequence position answered
+            response: The chosen stimulus
+            correct: Whether it matched the sequence
+            response_ns: perf_counter_ns() of the press that chose it
+            event_ms: Tk event time of the press, if known
+        """
+        row = self._level_first_row + position
+        if row >= len(self.trials):
+            return
+        
+        trials = self.trials
+        trials.set(row, 'response', response)
+        trials.set(row, 'response_ns', response_ns)
+        trials.set(row, 'response_event_ms', event_ms)
+        trials.set(row, 'rt_ns', response_ns - self._response_start_ns)
+        trials.set(row, 'iri_ns', response_ns - self._last_response_ns)
+        trials.set(row, 'correct', 1 if correct else 0)
+        
+        self._last_response_ns = response_ns
+    
+    def level_response_times(self):
+        """
+        Get the response timing of the current level.
+        
+        Returns:
+            (reaction times, inter-response intervals, event times): the
+            first two in milliseconds, the last the Tk event time of each
+            press (None where unknown); one entry per response given so far
+        """
+        first = self._level_first_row
+        responded = self.trials.column('response_ns')[first:]
+        rts = self.trials.column('rt_ns')[first:]
+        intervals = self.trials.column('iri_ns')[first:]
+        events = self.trials.column('response_event_ms')[first:]
+        return (
+            [round(rt / 1e6, 1) for rt, ns in zip(rts, responded) if ns != MISSING],
+            [round(iri / 1e6, 1) for iri, ns in zip(intervals, responded) if ns != MISSING],
+            [None if ms == MISSING else ms for ms, ns in zip(events, responded) if ns != MISSING]
+        )
+    
+    def trial_details(self):
+        """
+        Get the details of the current level for logging.
+        
+        Returns:
+            Keyword arguments for utils.log_trial / utils.update_record
+        """
+        response_times, intervals, event_times = self.level_response_times()
+        return {
+            'sequence': self.sequence,
+            'responses': self.user_sequence,
+            'response_times': response_times,
+            'intervals': intervals,
+            'event_times': event_times,
+            'valid': self._level_valid
+        }
     
     def show_help_tooltip(self, widget, title, description):
         """Display help tooltip."""
         self.help_tooltip = ctk.CTkFrame(
-            self.app, 
+            self.screen, 
             fg_color="white", 
             corner_radius=10, 
             border_width=2, 
@@ -35,7 +491,7 @@ class BaseGame:
         title_label = ctk.CTkLabel(
             self.help_tooltip,
             text=title,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=font(14, "bold"),
             text_color="gray20"
         )
         title_label.pack(padx=15, pady=(10, 5))
@@ -43,7 +499,7 @@ class BaseGame:
         desc_label = ctk.CTkLabel(
             self.help_tooltip,
             text=description,
-            font=ctk.CTkFont(size=12),
+            font=font(12),
             justify="left",
             text_color="gray30"
         )
@@ -59,12 +515,23 @@ class BaseGame:
         """Hide help tooltip."""
         if hasattr(self, 'help_tooltip'):
             self.help_tooltip.destroy()
+            del self.help_tooltip
     
     def show_game_over_modal(self, game_name, score, on_restart):
         """Show game over modal dialog."""
-        overlay = ctk.CTkFrame(self.app, fg_color="gray40")
-        overlay.place(x=0, y=0, relwidth=1, relheight=1)
+        if self.game_over_overlay is None:
+            self._build_game_over_modal()
+        
+        self.game_over_score.configure(text=f"Your score: Level {score}")
+        self._on_restart = on_restart
+        self.game_over_overlay.place(x=0, y=0, relwidth=1, relheight=1)
+        self.game_over_overlay.lift()
+    
+    def _build_game_over_modal(self):
+        """Create the game over modal once; it is shown and hidden afterwards."""
+        overlay = ctk.CTkFrame(self.screen, fg_color="gray40")
         overlay.configure(corner_radius=0)
+        self.game_over_overlay = overlay
         
         modal_frame = ctk.CTkFrame(
             overlay, 
@@ -78,21 +545,22 @@ class BaseGame:
         ctk.CTkLabel(
             modal_frame,
             text="Game Over!",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=font(28, "bold"),
             text_color="gray20"
         ).pack(pady=30)
         
-        ctk.CTkLabel(
+        self.game_over_score = ctk.CTkLabel(
             modal_frame,
-            text=f"Your score: Level {score}",
-            font=ctk.CTkFont(size=24),
+            text="",
+            font=font(24),
             text_color="gray30"
-        ).pack(pady=20)
+        )
+        self.game_over_score.pack(pady=20)
         
         ctk.CTkLabel(
             modal_frame,
             text="Play again?",
-            font=ctk.CTkFont(size=18),
+            font=font(18),
             text_color="gray30"
         ).pack(pady=20)
         
@@ -104,7 +572,7 @@ class BaseGame:
             text="Yes",
             width=120,
             height=40,
-            command=lambda: [overlay.destroy(), on_restart()]
+            command=lambda: [overlay.place_forget(), self._on_restart()]
         ).pack(side="left", padx=10)
         
         ctk.CTkButton(
@@ -112,12 +580,12 @@ class BaseGame:
             text="No",
             width=120,
             height=40,
-            command=lambda: [overlay.destroy(), self.on_back()]
+            command=lambda: [overlay.place_forget(), self.on_back()]
         ).pack(side="left", padx=10)
     
     def create_top_frame(self, help_title, help_description):
         """Create top frame with back button, level label, and help button."""
-        top_frame = ctk.CTkFrame(self.app, height=50, fg_color="transparent")
+        top_frame = ctk.CTkFrame(self.screen, height=50, fg_color="transparent")
         top_frame.pack(fill="x", padx=20, pady=5)
         top_frame.pack_propagate(False)
         
@@ -133,7 +601,7 @@ class BaseGame:
         self.level_label = ctk.CTkLabel(
             top_frame,
             text=f"Level: {self.level}",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=font(16, "bold")
         )
         self.level_label.place(in_=top_frame, relx=0.5, rely=0.5, anchor="center")
         
@@ -142,7 +610,7 @@ class BaseGame:
             text="?",
             width=30,
             height=30,
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=font(18, "bold"),
             fg_color="gray70",
             hover_color="gray60"
         )
@@ -154,6 +622,33 @@ class BaseGame:
         
         return top_frame
     
-    def start(self):
-        """Start the game. Must be implemented by subclasses."""
-        raise NotImplementedError("Subclasses must implement start()")
+    def screen_background(self):
+        """Return the window background colour for the current appearance mode."""
+        light, dark = ctk.ThemeManager.theme["CTk"]["fg_color"]
+        return light if ctk.get_appearance_mode() == "Light" else dark
+    
+    def create_header(self):
+        """Create the status line under the top frame."""
+        self.header = ctk.CTkLabel(
+            self.screen,
+            text="Press 'Start' to begin",
+            font=font(16, "bold"),
+            height=30
+        )
+        self.header.pack(pady=5)
+        return self.header
+    
+    def create_start_button(self):
+        """Create the START button below the board."""
+        self.start_spacer = ctk.CTkFrame(self.screen, fg_color="transparent", height=45)
+        self.start_spacer.pack(pady=20)
+        
+        self.start_btn = ctk.CTkButton(
+            self.screen,
+            text="START",
+            font=font(18, "bold"),
+            width=180,
+            height=45,
+            command=lambda: self.fire('start')
+        )
+        return self.start_btn
@@ -0,0 +1,313 @@
+"""Boards of clickable cells drawn on a single Tk canvas."""
+import tkinter as tk
+from time import perf_counter_ns
+from styles import resolve_color
+
+
+def rounded_rect_points(x1, y1, x2, y2, radius):
+    """
+    Return polygon points that draw a rounded rectangle with smooth=True.
+
+    Every corner point is repeated so the spline stays straight along the
+    edges and only bends within radius of the corners.
+    """
+    radius = min(radius, (x2 - x1) / 2, (y2 - y1) / 2)
+    return [
+        x1 + radius, y1, x2 - radius, y1,
+        x2, y1, x2, y1,
+        x2, y1 + radius, x2, y2 - radius,
+        x2, y2, x2, y2,
+        x2 - radius, y2, x1 + radius, y2,
+        x1, y2, x1, y2,
+        x1, y2 - radius, x1, y1 + radius,
+        x1, y1, x1, y1
+    ]
+
+
+class CanvasCells:
+    """
+    Rounded, clickable cells drawn on one canvas.
+
+    Each cell is a single polygon item. Colour changes go through
+    itemconfigure() and are skipped when the cell already shows the colour,
+    and the cell under the pointer is found by the subclass's cell_at()
+    rather than by asking Tk which item was hit. A cell costs one canvas
+    item instead of a whole button widget.
+
+    A click is a press and release on the same cell, like a button; the
+    index of the cell is passed to on_click together with the
+    perf_counter_ns() and Tk event time of the press.
+
+    All cells carry the CELL_TAG tag, so colouring the whole board is one
+    itemconfigure() call and one redraw however many cells there are.
+    """
+
+    CELL_TAG = "cell"
+
+    def __init__(self, master, on_click, corner_radius=10, fill="gray85",
+                 hover_fill="gray75", background="gray92"):
+        """
+        Create an empty canvas.
+
+        Args:
+            master: Parent widget
+            on_click: Called with the index of the clicked cell, and the
+                perf_counter_ns() and Tk event time of the press
+            corner_radius: Radius of the cell corners
+            fill: Initial cell colour
+            hover_fill: Colour of an uncoloured cell under the pointer, None
+                to disable
+            background: Canvas background colour
+        """
+        self.on_click = on_click
+        self.corner_radius = corner_radius
+        self.hover_fill = hover_fill
+        self.items = []
+        self.fills = []
+        self._shown = []
+        self._hovered = None
+        self._pressed = None
+        self._press_ns = 0
+        self._press_event_ms = 0
+        self.canvas = tk.Canvas(master, background=background,
+                                highlightthickness=0, borderwidth=0)
+
+        # Kept as #rrggbb so it compares equal to pre-resolved colours
+        self.base_fill = resolve_color(self.canvas, fill)
+
+        self.canvas.bind("<ButtonPress-1>", self._on_press, add="+")
+        self.canvas.bind("<ButtonRelease-1>", self._on_release, add="+")
+        if hover_fill is not None:
+            self.canvas.bind("<Motion>", self._on_motion, add="+")
+            self.canvas.bind("<Leave>", lambda e: self._set_hovered(None), add="+")
+
+    def __len__(self):
+        return len(self.items)
+
+    def _create_cells(self, bounds):
+        """
+        Replace all cells with new ones in the base colour.
+
+        Args:
+            bounds: (x1, y1, x2, y2) of every cell, in index order
+        """
+        self.canvas.delete(self.CELL_TAG)
+        self.items = [
+            self.canvas.create_polygon(
+                rounded_rect_points(x1, y1, x2, y2, self.corner_radius),
+                smooth=True, fill=self.base_fill, outline="", tags=self.CELL_TAG
+            )
+            for x1, y1, x2, y2 in bounds
+        ]
+        self.fills = [self.base_fill] * len(self.items)
+        self._shown = [self.base_fill] * len(self.items)
+        self._hovered = None
+        self._pressed = None
+
+    def cell_at(self, x, y):
+        """Return the index of the cell at canvas coordinates, or None."""
+        raise NotImplementedError("Subclasses must implement cell_at()")
+
+    def set_fill(self, index, color):
+        """Colour one cell; does nothing if it already has that colour."""
+        self.fills[index] = color
+        self._show(index)
+
+    def set_fills(self, colors):
+        """
+        Colour several cells at once.
+
+        The item changes are all made before control returns to Tk, so they
+        are drawn together in the next redraw.
+
+        A change of every cell to one colour is made with fill_all().
+
+        Args:
+            colors: Iterable of (index, colour)
+        """
+        colors = list(colors)
+        if len(colors) == len(self.items) and len({color for _, color in colors}) == 1:
+            self.fill_all(colors[0][1])
+            return
+        for index, color in colors:
+            self.fills[index] = color
+            self._show(index)
+
+    def fill_all(self, color):
+        """Colour every cell with a single itemconfigure() on the cell tag."""
+        count = len(self.items)
+        self.fills = [color] * count
+        if self._shown.count(color) != count:
+            self.canvas.itemconfigure(self.CELL_TAG, fill=color)
+            self._shown = [color] * count
+        if self._hovered is not None:
+            self._show(self._hovered)
+
+    def _show(self, index):
+        """Draw a cell in its colour, or the hover colour under the pointer."""
+        color = self.fills[index]
+        if index == self._hovered and color == self.base_fill:
+            color = self.hover_fill
+        if self._shown[index] != color:
+            self._shown[index] = color
+            self.canvas.itemconfigure(self.items[index], fill=color)
+
+    def _set_hovered(self, index):
+        """Move the hover highlight to another cell."""
+        previous, self._hovered = self._hovered, index
+        if previous is not None:
+            self._show(previous)
+        if index is not None:
+            self._show(index)
+
+    def _on_motion(self, event):
+        index = self.cell_at(event.x, event.y)
+        if index != self._hovered:
+            self._set_hovered(index)
+
+    def _on_press(self, event):
+        self._press_ns = perf_counter_ns()
+        self._press_event_ms = event.time
+        self._pressed = self.cell_at(event.x, event.y)
+
+    def _on_release(self, event):
+        pressed, self._pressed = self._pressed, None
+        if pressed is not None and pressed == self.cell_at(event.x, event.y):
+            self.on_click(pressed, self._press_ns, self._press_event_ms)
+
+
+class CanvasGrid(CanvasCells):
+    """
+    A rows x columns grid of cells on one canvas.
+
+    The cell under the pointer is found by arithmetic on the grid pitch.
+    """
+
+    def __init__(self, master, rows, columns, on_click, cell_size=110, gap=16,
+                 padding=8, corner_radius=10, fill="gray85", hover_fill="gray75",
+                 background="gray92"):
+        """
+        Create the canvas and its cells.
+
+        Args:
+            master: Parent widget
+            rows: Number of rows
+            columns: Number of columns
+            on_click: Called with the cell index (row * columns + column),
+                and the perf_counter_ns() and Tk event time of the press
+            cell_size: Width and height of a cell in pixels
+            gap: Space between neighbouring cells
+            padding: Space between the outer cells and the canvas edge
+            corner_radius: Radius of the cell corners
+            fill: Initial cell colour
+            hover_fill: Colour of an uncoloured cell under the pointer, None
+                to disable
+            background: Canvas background colour
+        """
+        super().__init__(master, on_click, corner_radius, fill, hover_fill, background)
+        self.padding = padding
+        self.resize(rows, columns, cell_size, gap)
+
+    def resize(self, rows, columns, cell_size, gap):
+        """
+        Replace the cells with a new grid, all in the base colour.
+
+        Args:
+            rows: Number of rows
+            columns: Number of columns
+            cell_size: Width and height of a cell in pixels
+            gap: Space between neighbouring cells
+        """
+        self.rows = rows
+        self.columns = columns
+        self.cell_size = cell_size
+        self.pitch = cell_size + gap
+        self.canvas.configure(
+            width=columns * cell_size + (columns - 1) * gap + 2 * self.padding,
+            height=rows * cell_size + (rows - 1) * gap + 2 * self.padding
+        )
+        self._create_cells(self.cell_bounds(index) for index in range(rows * columns))
+
+    def cell_bounds(self, index):
+        """Return (x1, y1, x2, y2) of a cell in canvas coordinates."""
+        row, column = divmod(index, self.columns)
+        x1 = self.padding + column * self.pitch
+        y1 = self.padding + row * self.pitch
+        return x1, y1, x1 + self.cell_size, y1 + self.cell_size
+
+    def cell_at(self, x, y):
+        """
+        Return the index of the cell at canvas coordinates, or None.
+
+        Points in the gaps between cells belong to no cell.
+        """
+        column, column_offset = divmod(x - self.padding, self.pitch)
+        row, row_offset = divmod(y - self.padding, self.pitch)
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        if column_offset >= self.cell_size or row_offset >= self.cell_size:
+            return None
+        return int(row) * self.columns + int(column)
+
+
+class CanvasBlocks(CanvasCells):
+    """
+    Square blocks at arbitrary positions on one canvas.
+
+    Clicks are resolved through a uniform-grid spatial index: the canvas
+    is divided into buckets one block wide, each listing the blocks that
+    overlap it. A point is looked up in its bucket and tested against the
+    few blocks listed there, so hit testing costs the same for 12 blocks
+    as for hundreds.
+    """
+
+    def __init__(self, master, width, height, block_size, on_click, corner_radius=10,
+                 fill="gray85", hover_fill="gray75", background="gray90"):
+        """
+        Create the canvas; blocks are added with set_layout().
+
+        Args:
+            master: Parent widget
+            width: Canvas width in pixels
+            height: Canvas height in pixels
+            block_size: Side of a block
+            on_click: Called with the index of the clicked block, and the
+                perf_counter_ns() and Tk event time of the press
+            corner_radius: Radius of the block corners
+            fill: Initial block colour
+            hover_fill: Colour of an uncoloured block under the pointer,
+                None to disable
+            background: Canvas background colour
+        """
+        super().__init__(master, on_click, corner_radius, fill, hover_fill, background)
+        self.canvas.configure(width=width, height=height)
+        self.block_size = block_size
+        self.positions = []
+        self._buckets = {}
+
+    def set_layout(self, positions):
+        """
+        Replace the blocks and rebuild the spatial index.
+
+        Args:
+            positions: (x, y) top-left corner of every block
+        """
+        size = self.block_size
+        self.positions = list(positions)
+        self._create_cells((x, y, x + size, y + size) for x, y in self.positions)
+
+        buckets = {}
+        for index, (x, y) in enumerate(self.positions):
+            for bx in range(x // size, (x + size - 1) // size + 1):
+                for by in range(y // size, (y + size - 1) // size + 1):
+                    buckets.setdefault((bx, by), []).append(index)
+        self._buckets = buckets
+
+    def cell_at(self, x, y):
+        """Return the index of the block at canvas coordinates, or None."""
+        size = self.block_size
+        for index in self._buckets.get((int(x) // size, int(y) // size), ()):
+            bx, by = self.positions[index]
+            if bx <= x < bx + size and by <= y < by + size:
+                return index
+        return None
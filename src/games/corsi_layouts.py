@@ -0,0 +1,244 @@
+"""
+Library of precomputed, validated Corsi board layouts.
+
+The library is a little-endian binary file:
+
+    header    magic b'CRSL', version, board width, board height, block size,
+              layout count
+    offsets   one uint32 file offset per layout
+    layouts   block count, smallest gap, spread, path length, then the
+              (x, y) top-left corner of every block as uint16 pairs
+
+The file is memory-mapped when first used and each layout is unpacked on
+demand, so opening the library is O(1) whatever its size, and so is
+looking up a layout by index.
+"""
+import os
+import math
+import mmap
+import random
+import struct
+from atomic_io import atomic_write_bytes
+from utils import get_asset_path
+from .block_placement import place_blocks
+
+
+MAGIC = b'CRSL'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHHI')
+OFFSET = struct.Struct('<I')
+LAYOUT_HEADER = struct.Struct('<HHff')
+POINT = struct.Struct('<HH')
+
+BOARD_WIDTH = 650
+BOARD_HEIGHT = 420
+BLOCK_SIZE = 70
+BLOCK_SPACING = 12
+BOARD_MARGIN = 10
+
+# Layout 0: a fixed, irregular nine-block board drawn up for this game (not
+# the coordinates of any published apparatus), so sessions can be compared
+# on one board
+REFERENCE_LAYOUT = [
+    (60, 300), (215, 250), (120, 150), (330, 320), (300, 110),
+    (470, 200), (420, 20), (540, 330), (545, 60),
+]
+
+
+class Layout:
+    """A board layout and its difficulty metrics."""
+
+    __slots__ = ('index', 'positions', 'min_gap', 'spread', 'path_length')
+
+    def __init__(self, index, positions, min_gap, spread, path_length):
+        self.index = index
+        self.positions = positions
+        self.min_gap = min_gap
+        self.spread = spread
+        self.path_length = path_length
+
+    def __len__(self):
+        return len(self.positions)
+
+
+def layout_metrics(positions, block_size=BLOCK_SIZE):
+    """
+    Measure a layout.
+
+    Args:
+        positions: (x, y) top-left corners of the blocks
+        block_size: Side of a block
+
+    Returns:
+        (min_gap, spread, path_length): the smallest edge-to-edge gap
+        between two blocks, the mean distance from a block to its nearest
+        neighbour, and the mean distance between two distinct blocks, which
+        is the expected length of one move of a random sequence
+    """
+    count = len(positions)
+    nearest = [math.inf] * count
+    total = 0.0
+    min_gap = math.inf
+    for i in range(count):
+        xi, yi = positions[i]
+        for j in range(i + 1, count):
+            xj, yj = positions[j]
+            distance = math.hypot(xi - xj, yi - yj)
+            total += distance
+            nearest[i] = min(nearest[i], distance)
+            nearest[j] = min(nearest[j], distance)
+            min_gap = min(min_gap, max(abs(xi - xj), abs(yi - yj)) - block_size)
+    pairs = count * (count - 1) // 2
+    return (
+        int(min_gap) if pairs else 0,
+        sum(nearest) / count if pairs else 0.0,
+        total / pairs if pairs else 0.0
+    )
+
+
+def validate_layout(positions, width=BOARD_WIDTH, height=BOARD_HEIGHT,
+                    block_size=BLOCK_SIZE, spacing=BLOCK_SPACING, margin=BOARD_MARGIN):
+    """
+    Check that every block lies on the board and no two are too close.
+
+    Raises:
+        ValueError: Describing the first problem found
+    """
+    for x, y in positions:
+        if not (margin <= x <= width - margin - block_size and
+                margin <= y <= height - margin - block_size):
+            raise ValueError(f"block at ({x}, {y}) is off the board")
+    min_gap = layout_metrics(positions, block_size)[0]
+    if len(positions) > 1 and min_gap < spacing:
+        raise ValueError(f"blocks are {min_gap}px apart, less than {spacing}px")
+
+
+def generate_layouts(count, blocks=12, seed=0, candidates_per_layout=8):
+    """
+    Generate validated layouts of similar difficulty.
+
+    Candidates are sampled with place_blocks(); only those whose spread and
+    path length both lie between the quartiles of all candidates are kept,
+    which drops crowded and scattered boards. The reference board is
+    always layout 0.
+
+    Args:
+        count: Number of layouts including the reference one
+        blocks: Blocks per generated layout
+        seed: Seed of the generator, so a library can be rebuilt exactly
+        candidates_per_layout: Candidates sampled per layout kept
+
+    Returns:
+        List of Layout
+    """
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(max(1, count - 1) * candidates_per_layout):
+        positions = place_blocks(blocks, BOARD_WIDTH, BOARD_HEIGHT, BLOCK_SIZE,
+                                 spacing=BLOCK_SPACING, margin=BOARD_MARGIN, rng=rng)
+        validate_layout(positions)
+        candidates.append((positions, layout_metrics(positions)))
+
+    def quartiles(values):
+        values = sorted(values)
+        return values[len(values) // 4], values[(3 * len(values)) // 4]
+
+    spread_low, spread_high = quartiles(m[1] for _, m in candidates)
+    path_low, path_high = quartiles(m[2] for _, m in candidates)
+    kept = [
+        (positions, metrics) for positions, metrics in candidates
+        if spread_low <= metrics[1] <= spread_high and path_low <= metrics[2] <= path_high
+    ]
+    if len(kept) < count - 1:
+        raise ValueError(f"only {len(kept)} of {count - 1} layouts passed validation; "
+                         f"sample more candidates")
+
+    validate_layout(REFERENCE_LAYOUT)
+    layouts = [Layout(0, list(REFERENCE_LAYOUT), *layout_metrics(REFERENCE_LAYOUT))]
+    for positions, metrics in kept[:count - 1]:
+        layouts.append(Layout(len(layouts), positions, *metrics))
+    return layouts
+
+
+def write_library(path, layouts):
+    """Write layouts to a library file, replacing it atomically."""
+    offsets = []
+    body = bytearray()
+    base = HEADER.size + OFFSET.size * len(layouts)
+    for layout in layouts:
+        offsets.append(base + len(body))
+        body += LAYOUT_HEADER.pack(len(layout.positions), layout.min_gap,
+                                   layout.spread, layout.path_length)
+        for x, y in layout.positions:
+            body += POINT.pack(x, y)
+
+    data = bytearray(HEADER.pack(MAGIC, VERSION, BOARD_WIDTH, BOARD_HEIGHT,
+                                 BLOCK_SIZE, len(layouts)))
+    for offset in offsets:
+        data += OFFSET.pack(offset)
+    data += body
+    atomic_write_bytes(path, bytes(data))
+
+
+class LayoutLibrary:
+    """A memory-mapped layout library file."""
+
+    def __init__(self, path):
+        """
+        Map a library file.
+
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If it is not a layout library
+        """
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError(f"{path} is too short to be a Corsi layout library")
+        magic, version, width, height, block_size, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} Corsi layout library")
+        self.board_size = (width, height)
+        self.block_size = block_size
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """Return layout number index."""
+        if not 0 <= index < self._count:
+            raise IndexError(f"layout {index} out of range")
+        offset = OFFSET.unpack_from(self._map, HEADER.size + OFFSET.size * index)[0]
+        blocks, min_gap, spread, path_length = LAYOUT_HEADER.unpack_from(self._map, offset)
+        start = offset + LAYOUT_HEADER.size
+        positions = [POINT.unpack_from(self._map, start + POINT.size * i) for i in range(blocks)]
+        return Layout(index, positions, min_gap, spread, path_length)
+
+    def close(self):
+        self._map.close()
+
+
+_library = None
+_library_loaded = False
+
+
+def get_library():
+    """
+    Return the shipped layout library, mapping it on first use.
+
+    Returns:
+        LayoutLibrary, or None if the library file is missing or invalid
+    """
+    global _library, _library_loaded
+    if not _library_loaded:
+        _library_loaded = True
+        path = get_asset_path('corsi_layouts.bin')
+        if os.path.exists(path):
+            try:
+                _library = LayoutLibrary(path)
+            except (OSError, ValueError) as e:
+                print(f"Error loading Corsi layouts: {e}")
+    return _library
@@ -0,0 +1,190 @@
+"""
+Rules of the sequence-recall games, independent of any toolkit.
+
+An engine holds the sequence, the responses and the level of one game
+and decides the outcome of every response. The CTk game classes are
+views over an engine: they present engine.sequence, pass the player's
+choices to respond() and show the result. Without a view, an engine can
+be driven by simulate() to play large numbers of games quickly, for
+testing and for generating norms.
+"""
+import random
+
+
+CORRECT = 'correct'
+PASSED = 'passed'
+FAILED = 'failed'
+
+GAP_MS = 200
+
+
+def presentation_ms(level):
+    """Return how long each stimulus of a level stays visible, in milliseconds."""
+    return max(400, 800 - level * 30)
+
+
+class SequenceEngine:
+    """
+    A game where the sequence grows by one random stimulus per level.
+
+    A level is begun with step(), answered with respond() and, once
+    passed, closed with complete_level(). The game ends at the first
+    wrong response; the score is the number of levels cleared.
+    """
+
+    def __init__(self, stimulus_count, seed=None, rng=None):
+        """
+        Create an engine at level 1.
+
+        Args:
+            stimulus_count: Number of distinct stimuli a sequence is drawn from
+            seed: Seed for a private random generator, for reproducible games
+            rng: random.Random to draw from; overrides seed
+        """
+        self.stimulus_count = stimulus_count
+        self.rng = random.Random(seed) if rng is None else rng
+        self.reset()
+
+    def reset(self):
+        """Start a new game at level 1."""
+        self.level = 1
+        self.sequence = []
+        self.responses = []
+        self.over = False
+
+    @property
+    def score(self):
+        """Number of levels cleared."""
+        return self.level - 1
+
+    def presentation_ms(self):
+        """How long each stimulus of the current level stays visible."""
+        return presentation_ms(self.level)
+
+    def step(self):
+        """
+        Begin the current level by extending the sequence by one stimulus.
+
+        Returns:
+            The sequence to present
+        """
+        self.responses = []
+        self.sequence.append(self.rng.randrange(self.stimulus_count))
+        return self.sequence
+
+    def respond(self, stimulus):
+        """
+        Judge the player's next response.
+
+        Returns:
+            FAILED if it is wrong, which ends the game; PASSED if it
+            correctly completes the sequence; CORRECT otherwise
+        """
+        position = len(self.responses)
+        self.responses.append(stimulus)
+        if stimulus != self.sequence[position]:
+            self.over = True
+            return FAILED
+        if position + 1 == len(self.sequence):
+            return PASSED
+        return CORRECT
+
+    def complete_level(self):
+        """Move on to the next level after a passed one."""
+        self.level += 1
+
+
+class SpatialEngine(SequenceEngine):
+    """Spatial Memory Game: stimuli are the cells of a square grid."""
+
+    def __init__(self, grid_size=3, seed=None, rng=None):
+        self.grid_size = grid_size
+        super().__init__(grid_size * grid_size, seed, rng)
+
+    def resize(self, grid_size):
+        """Change the grid between games."""
+        self.grid_size = grid_size
+        self.stimulus_count = grid_size * grid_size
+
+
+class CorsiEngine(SequenceEngine):
+    """Corsi Block Test: stimuli are the blocks of the current board."""
+
+    def __init__(self, blocks=12, seed=None, rng=None):
+        super().__init__(blocks, seed, rng)
+
+    def set_blocks(self, blocks):
+        """Change the number of blocks when a new board is laid out."""
+        self.stimulus_count = blocks
+
+
+class SpanEngine(SequenceEngine):
+    """Memory Span: stimuli are the digits 0-9."""
+
+    def __init__(self, seed=None, rng=None):
+        super().__init__(10, seed, rng)
+
+
+def span_player(span, lapse_rate=0.0):
+    """
+    Create a simulated player for simulate().
+
+    The player recalls sequences up to span items perfectly, except that
+    each item is forgotten with probability lapse_rate; the first item
+    past span is always forgotten. A forgotten item is answered with a
+    different, random stimulus.
+
+    Args:
+        span: Longest sequence the player can hold
+        lapse_rate: Chance of forgetting any one item
+
+    Returns:
+        Callable(engine) returning the player's responses for the level
+    """
+    def play(engine):
+        rng = engine.rng
+        responses = []
+        for position, stimulus in enumerate(engine.sequence):
+            if position >= span or (lapse_rate and rng.random() < lapse_rate):
+                wrong = rng.randrange(engine.stimulus_count - 1)
+                responses.append(wrong + 1 if wrong >= stimulus else wrong)
+                break
+            responses.append(stimulus)
+        return responses
+
+    return play
+
+
+def simulate(engine, player, games, max_level=100):
+    """
+    Play games on an engine with a simulated player.
+
+    A level whose responses end before the sequence does counts as failed.
+
+    Args:
+        engine: SequenceEngine to play on; it is reset before every game
+        player: Callable(engine) returning the responses to engine.sequence
+        games: Number of games to play
+        max_level: Level at which a game is stopped if it has not ended
+
+    Returns:
+        (scores, trials): the score of every game and the total number
+        of responses given
+    """
+    scores = []
+    trials = 0
+    for _ in range(games):
+        engine.reset()
+        while engine.level <= max_level:
+            engine.step()
+            result = FAILED
+            for response in player(engine):
+                trials += 1
+                result = engine.respond(response)
+                if result != CORRECT:
+                    break
+            if result != PASSED:
+                break
+            engine.complete_level()
+        scores.append(engine.score)
+    return scores, trials
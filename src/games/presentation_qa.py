@@ -0,0 +1,74 @@
+"""Quality checks on how long stimuli were actually on screen."""
+
+
+NS_PER_MS = 1_000_000
+DEFAULT_TOLERANCE_MS = 34
+
+
+class PresentationMonitor:
+    """
+    Compare measured stimulus durations with the intended ones.
+
+    A stimulus whose on-screen duration (from the end of the redraw that
+    showed it to the end of the redraw that hid it) differs from the
+    intended duration by more than the tolerance is a deadline miss.
+    Statistics accumulate until reset(), normally once per session.
+    """
+
+    __slots__ = ('tolerance_ns', 'stimuli', 'misses', 'max_deviation_ns', 'total_deviation_ns')
+
+    def __init__(self, tolerance_ms=DEFAULT_TOLERANCE_MS):
+        """
+        Create a monitor.
+
+        Args:
+            tolerance_ms: Largest accepted deviation from the intended duration
+        """
+        self.tolerance_ns = int(tolerance_ms * NS_PER_MS)
+        self.reset()
+
+    def reset(self):
+        """Forget all measurements."""
+        self.stimuli = 0
+        self.misses = 0
+        self.max_deviation_ns = 0
+        self.total_deviation_ns = 0
+
+    def check(self, onset_ns, offset_ns, intended_ns):
+        """
+        Record one stimulus and tell whether it was shown within tolerance.
+
+        Args:
+            onset_ns: When the redraw showing the stimulus completed
+            offset_ns: When the redraw hiding it completed
+            intended_ns: Intended on-screen duration
+
+        Returns:
+            True if the duration was within tolerance
+        """
+        deviation = abs((offset_ns - onset_ns) - intended_ns)
+        self.stimuli += 1
+        self.total_deviation_ns += deviation
+        if deviation > self.max_deviation_ns:
+            self.max_deviation_ns = deviation
+        if deviation > self.tolerance_ns:
+            self.misses += 1
+            return False
+        return True
+
+    def summary(self):
+        """
+        Summarize the deadline misses measured so far.
+
+        Returns:
+            Dictionary with the stimulus and miss counts, the miss rate and
+            the mean and maximum deviation in milliseconds
+        """
+        return {
+            'stimuli': self.stimuli,
+            'misses': self.misses,
+            'miss_rate': self.misses / self.stimuli if self.stimuli else 0.0,
+            'mean_dev_ms': round(self.total_deviation_ns / self.stimuli / NS_PER_MS, 2)
+            if self.stimuli else 0.0,
+            'max_dev_ms': round(self.max_deviation_ns / NS_PER_MS, 2)
+        }
@@ -0,0 +1,78 @@
+"""
+Registry of the games, created only when they are first played.
+
+Each game is registered under a short name with a factory function that
+imports the game's module and returns its class. Nothing is imported
+until a game is asked for, so starting the program costs no game imports
+or screen construction; the module is imported and the game instantiated
+when its menu button is first pressed.
+
+The factories use ordinary import statements rather than importlib, so
+PyInstaller's import analysis still finds every game module.
+"""
+
+
+def _spatial():
+    from .spatial_memory_game import SpatialMemoryGame
+    return SpatialMemoryGame
+
+
+def _corsi():
+    from .corsi_block_test import CorsiBlockTest
+    return CorsiBlockTest
+
+
+def _span():
+    from .memory_span_game import MemorySpanGame
+    return MemorySpanGame
+
+
+GAMES = {
+    'spatial': _spatial,
+    'corsi': _corsi,
+    'span': _span,
+}
+
+
+class GameRegistry:
+    """Games by name, each imported and instantiated on first use."""
+
+    def __init__(self, app, on_back, games=None):
+        """
+        Initialize the registry; no game is loaded yet.
+
+        Args:
+            app: Main CTk application window
+            on_back: Callback passed to every game to return to the menu
+            games: Dictionary of game name -> function returning the game
+                class; GAMES if None
+        """
+        self.app = app
+        self.on_back = on_back
+        self.factories = dict(GAMES if games is None else games)
+        self._games = {}
+
+    def names(self):
+        """Return the names of all registered games."""
+        return list(self.factories)
+
+    def get(self, name):
+        """
+        Return the game instance, importing and creating it on first use.
+
+        Raises:
+            KeyError: If no game is registered under name
+        """
+        game = self._games.get(name)
+        if game is None:
+            game_class = self.factories[name]()
+            game = self._games[name] = game_class(self.app, self.on_back)
+        return game
+
+    def start(self, name):
+        """Start a game, loading it first if needed."""
+        self.get(name).start()
+
+    def starter(self, name):
+        """Return a callback that starts the game, for use as a button command."""
+        return lambda: self.start(name)
@@ -1,8 +1,41 @@
 """Spatial Memory Game - Remember sequence of highlighted squares."""
 import customtkinter as ctk
-import random
 from .base_game import BaseGame
-from utils import load_records, update_record
+from .canvas_board import CanvasGrid
+from .engine import SpatialEngine
+
+
+DEFAULT_GRID_SIZE = 3
+MAX_GRID_SIZE = 12
+BOARD_SIZE = 404
+BOARD_PADDING = 8
+
+
+def grid_geometry(grid_size):
+    """
+    Get the cell size and gap that fit a square grid on the board.
+    
+    Args:
+        grid_size: Number of rows and columns
+        
+    Returns:
+        (cell_size, gap) in pixels; 3x3 keeps the classic 110 px cells
+    """
+    gap = max(4, 48 // grid_size)
+    cell_size = min(110, (BOARD_SIZE - 2 * BOARD_PADDING - (grid_size - 1) * gap) // grid_size)
+    return cell_size, gap
+
+
+def record_name(grid_size):
+    """
+    Get the name results on a grid size are recorded under.
+    
+    Each size is a game of its own difficulty, so bests, statistics and
+    analytics are kept per size; 3x3 keeps the original name.
+    """
+    if grid_size == DEFAULT_GRID_SIZE:
+        return SpatialMemoryGame.GAME_NAME
+    return f"{SpatialMemoryGame.GAME_NAME} {grid_size}x{grid_size}"
 
 
 class SpatialMemoryGame(BaseGame):
@@ -10,19 +43,49 @@ class SpatialMemoryGame(BaseGame):
     
     GAME_NAME = "Spatial Memory Game"
     
-    def start(self):
-        """Start the spatial memory game."""
-        for widget in self.app.winfo_children():
-            widget.destroy()
-        
-        self.sequence = []
-        self.user_sequence = []
-        self.level = 1
-        self.is_playing = False
-        self.is_showing = False
-        self.game_started = False
-        
-        self.create_top_frame(
+    def __init__(self, app, on_back, grid_size=DEFAULT_GRID_SIZE):
+        """
+        Initialize the game.
+        
+        Args:
+            app: Main CTk application window
+            on_back: Callback function to return to main menu
+            grid_size: Rows and columns of the grid, 2 to MAX_GRID_SIZE
+        """
+        self.grid = None
+        self.grid_size = max(2, min(MAX_GRID_SIZE, grid_size))
+        super().__init__(app, on_back)
+    
+    @property
+    def record_name(self):
+        """Results are recorded per grid size."""
+        return record_name(self.grid_size)
+    
+    def session_details(self):
+        """Record the grid size the session is played on."""
+        return {'grid_size': self.grid_size}
+    
+    def create_engine(self):
+        """Play on the cells of the grid."""
+        return SpatialEngine(self.grid_size)
+    
+    def set_grid_size(self, grid_size):
+        """
+        Change the grid dimensions between games.
+        
+        Args:
+            grid_size: Rows and columns of the grid, 2 to MAX_GRID_SIZE
+        """
+        self.grid_size = max(2, min(MAX_GRID_SIZE, grid_size))
+        self.engine.resize(self.grid_size)
+        if self.grid is not None:
+            cell_size, gap = grid_geometry(self.grid_size)
+            self.grid.resize(self.grid_size, self.grid_size, cell_size, gap)
+            self.forget_board_colors()
+    
+    def build_screen(self):
+        """Build the grid screen."""
+        top_frame = self.create_top_frame(
             "Spatial Memory Game",
             "Remember the sequence of highlighted squares.\n\n"
             "Develops:\n"
@@ -31,168 +94,52 @@ class SpatialMemoryGame(BaseGame):
             "• Sequential memory"
         )
         
-        self.header = ctk.CTkLabel(
-            self.app,
-            text="Press 'Start' to begin",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            height=30
-        )
-        self.header.pack(pady=5)
+        self.create_header()
         
-        game_area = ctk.CTkFrame(self.app, fg_color="transparent", height=420)
+        game_area = ctk.CTkFrame(self.screen, fg_color="transparent", height=420)
         game_area.pack(fill="x", padx=25, pady=5)
         game_area.pack_propagate(False)
         
-        grid_frame = ctk.CTkFrame(game_area, fg_color="transparent")
-        grid_frame.place(relx=0.5, rely=0.5, anchor="center")
-        
-        self.buttons = []
-        button_size = 110
-        
-        for i in range(3):
-            row = []
-            for j in range(3):
-                btn = ctk.CTkButton(
-                    grid_frame,
-                    text="",
-                    width=button_size,
-                    height=button_size,
-                    corner_radius=10,
-                    fg_color="gray85",
-                    hover_color="gray75",
-                    command=lambda idx=i*3+j: self._button_clicked(idx)
-                )
-                btn.grid(row=i, column=j, padx=8, pady=8)
-                row.append(btn)
-            self.buttons.append(row)
-        
-        button_spacer = ctk.CTkFrame(self.app, fg_color="transparent", height=45)
-        button_spacer.pack(pady=20)
-        
-        self.start_btn = ctk.CTkButton(
-            self.app,
-            text="START",
-            font=ctk.CTkFont(size=18, weight="bold"),
-            width=180,
-            height=45,
-            command=self._start_level
+        cell_size, gap = grid_geometry(self.grid_size)
+        self.grid = CanvasGrid(
+            game_area,
+            rows=self.grid_size,
+            columns=self.grid_size,
+            on_click=self.respond,
+            cell_size=cell_size,
+            gap=gap,
+            padding=BOARD_PADDING,
+            corner_radius=10,
+            fill="gray85",
+            hover_fill="gray75",
+            background=self.screen_background()
         )
-        self.start_btn.place(in_=button_spacer, relx=0.5, rely=0.5, anchor="center")
-    
-    def _button_clicked(self, index):
-        """Handle button click."""
-        if not self.game_started or not self.is_playing or self.is_showing:
-            return
-        
-        self.user_sequence.append(index)
-        
-        row, col = index // 3, index % 3
-        self._highlight_button(row, col, "#1f6aa5")
-        
-        if self.user_sequence[-1] != self.sequence[len(self.user_sequence)-1]:
-            self.app.after(300, lambda: self._game_over())
-        elif len(self.user_sequence) == len(self.sequence):
-            self.app.after(300, lambda: self._level_complete())
-        else:
-            self.app.after(300, lambda: self._reset_button(row, col))
-    
-    def _start_level(self):
-        """Start a new level."""
-        self.game_started = True
-        self.start_btn.place_forget()
-        
-        def countdown(count):
-            if count > 0:
-                self.header.configure(text=f"{count}")
-                self.app.after(1000, lambda: countdown(count - 1))
-            else:
-                self._begin_level()
-        
-        if self.level == 1:
-            countdown(3)
-        else:
-            self._begin_level()
-    
-    def _begin_level(self):
-        """Begin the level sequence."""
-        self.is_playing = True
-        self.is_showing = True
-        self.user_sequence = []
-        
-        self.sequence.extend([random.randint(0, 8) for _ in range(1)])
-        
-        self.header.configure(text="Watch the sequence...")
-        
-        self._show_sequence()
-    
-    def _show_sequence(self):
-        """Show the sequence to memorize."""
-        delay = max(400, 800 - (self.level * 30))
-        
-        def show_next(index=0):
-            if index < len(self.sequence):
-                pos = self.sequence[index]
-                row, col = pos // 3, pos % 3
-                
-                self._highlight_button(row, col, "#4a9eff")
-                
-                self.app.after(delay, lambda: self._reset_button(row, col))
-                self.app.after(delay + 200, lambda: show_next(index + 1))
-            else:
-                self.is_showing = False
-                self.header.configure(text="Repeat the sequence!")
+        self.grid.canvas.place(relx=0.5, rely=0.5, anchor="center")
+        
+        # Grid size can only be changed before a game starts
+        sizes = [f"{n}x{n}" for n in range(DEFAULT_GRID_SIZE, MAX_GRID_SIZE + 1)]
+        self.size_menu = ctk.CTkOptionMenu(
+            top_frame,
+            values=sizes,
+            width=90,
+            height=30,
+            command=lambda value: self.set_grid_size(int(value.split("x")[0]))
+        )
+        self.size_menu.set(f"{self.grid_size}x{self.grid_size}")
+        self.size_menu.pack(side="right", pady=5, padx=(0, 10))
         
-        show_next()
-    
-    def _highlight_button(self, row, col, color):
-        """Highlight a button with given color."""
-        try:
-            if hasattr(self, 'buttons') and self.buttons and row < len(self.buttons) and col < len(self.buttons[row]):
-                self.buttons[row][col].configure(fg_color=color)
-        except Exception:
-            pass
+        self.create_start_button()
     
-    def _reset_button(self, row, col):
-        """Reset button to default color."""
-        try:
-            if hasattr(self, 'buttons') and self.buttons and row < len(self.buttons) and col < len(self.buttons[row]):
-                self.buttons[row][col].configure(fg_color="gray85")
-        except Exception:
-            pass
-    
-    def _level_complete(self):
-        """Handle level completion."""
-        for i in range(3):
-            for j in range(3):
-                self.buttons[i][j].configure(fg_color="gray85")
-        
-        self.level += 1
-        records = load_records()
-        update_record(records, self.GAME_NAME, self.level - 1)
-        self.level_label.configure(text=f"Level: {self.level}")
-        self.header.configure(text="Great! Next level...")
-        self.is_playing = False
-        
-        self.app.after(1500, self._start_level)
+    def reset_view(self):
+        """Reset the screen and allow the grid size to be changed."""
+        super().reset_view()
+        self.size_menu.configure(state="normal")
     
-    def _game_over(self):
-        """Handle game over."""
-        self.is_playing = False
-        self.is_showing = False
-        
-        for i in range(3):
-            for j in range(3):
-                self.buttons[i][j].configure(fg_color="#8b0000")
-        
-        self.app.after(500, self._show_game_over_screen)
+    def _on_start(self):
+        """Lock the grid size for the game and start the countdown."""
+        self.size_menu.configure(state="disabled")
+        super()._on_start()
     
-    def _show_game_over_screen(self):
-        """Show game over screen."""
-        for i in range(3):
-            for j in range(3):
-                self.buttons[i][j].configure(fg_color="gray85")
-        
-        self.header.configure(text="Game Over!")
-        
-        score = self.level - 1
-        self.show_game_over_modal(self.GAME_NAME, score, self.start)
+    def draw_stimuli(self, changes):
+        """Recolour grid cells."""
+        self.grid.set_fills(changes)
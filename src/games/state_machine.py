@@ -0,0 +1,77 @@
+"""Table-driven state machine for game flow."""
+
+
+class StateMachine:
+    """
+    A finite state machine driven by a transition table.
+
+    The table maps (state, event) to the next state and an optional
+    action. Transitions are looked up in a dictionary, so dispatching an
+    event is O(1), and an event that has no entry for the current state is
+    rejected before anything else happens. Hooks are told about every
+    transition, which makes them the place for logging and instrumentation.
+    """
+
+    __slots__ = ('initial', 'state', '_table', '_hooks')
+
+    def __init__(self, transitions, initial, target=None):
+        """
+        Build a state machine.
+
+        Args:
+            transitions: Iterable of (state, event, next_state, action);
+                action is a method name on target, a callable or None
+            initial: Starting state
+            target: Object whose methods the action names refer to
+        """
+        self.initial = initial
+        self.state = initial
+        self._hooks = []
+        self._table = {}
+        for state, event, next_state, action in transitions:
+            if (state, event) in self._table:
+                raise ValueError(f"duplicate transition for {event!r} in {state!r}")
+            if isinstance(action, str):
+                action = getattr(target, action)
+            self._table[state, event] = (next_state, action)
+
+    def add_hook(self, hook):
+        """
+        Call hook(previous_state, event, next_state) on every transition.
+
+        Hooks run after the state has changed and before the action.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Stop calling a hook added with add_hook()."""
+        self._hooks.remove(hook)
+
+    def fire(self, event, *args):
+        """
+        Dispatch an event.
+
+        The state changes before the action runs, so an action may fire
+        follow-up events of its own.
+
+        Args:
+            event: Event name
+            *args: Passed to the transition's action
+
+        Returns:
+            True if the event was accepted, False if it was rejected
+        """
+        entry = self._table.get((self.state, event))
+        if entry is None:
+            return False
+        next_state, action = entry
+        previous, self.state = self.state, next_state
+        for hook in self._hooks:
+            hook(previous, event, next_state)
+        if action is not None:
+            action(*args)
+        return True
+
+    def reset(self):
+        """Return to the initial state without running any action."""
+        self.state = self.initial
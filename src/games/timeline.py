@@ -0,0 +1,89 @@
+"""Drift-compensated scheduling of stimulus presentation steps."""
+from time import perf_counter_ns
+
+
+NS_PER_MS = 1_000_000
+
+
+class Timeline:
+    """
+    A list of steps, each due at an absolute offset from the start.
+
+    Every step is scheduled against its own deadline on the monotonic
+    clock rather than relative to the previous step, so lateness of one
+    step (a slow redraw, a busy event loop) is not carried over to the
+    next. The scheduled time of every step is kept, so callers can record
+    it next to the time the step's effect was actually seen.
+    """
+
+    def __init__(self, app, steps, clock=perf_counter_ns):
+        """
+        Create a timeline.
+
+        Args:
+            app: Tk widget or TimerRegistry used to schedule callbacks
+            steps: List of (offset_ns, callback) sorted by offset
+            clock: Monotonic clock returning nanoseconds
+        """
+        self.app = app
+        self.steps = steps
+        self.clock = clock
+        self.start_ns = None
+        self.scheduled_ns = [0] * len(steps)
+        self._next = 0
+        self._after_id = None
+
+    @classmethod
+    def for_sequence(cls, app, count, on_ms, gap_ms, on_show, on_hide, on_done, clock=perf_counter_ns):
+        """
+        Compile a sequence presentation into a timeline.
+
+        Item i is shown at i * (on_ms + gap_ms) and hidden on_ms later;
+        on_done runs one full period after the last item was shown.
+
+        Args:
+            app: Tk widget or TimerRegistry used to schedule callbacks
+            count: Number of items
+            on_ms: How long each item stays visible
+            gap_ms: Blank interval between items
+            on_show: Called with the item index when it appears
+            on_hide: Called with the item index when it disappears
+            on_done: Called once the sequence is over
+        """
+        period = (on_ms + gap_ms) * NS_PER_MS
+        steps = []
+        for index in range(count):
+            steps.append((index * period, lambda i=index: on_show(i)))
+            steps.append((index * period + on_ms * NS_PER_MS, lambda i=index: on_hide(i)))
+        steps.append((count * period, on_done))
+        return cls(app, steps, clock)
+
+    def start(self):
+        """Start dispatching steps; the first one is due immediately."""
+        self.start_ns = self.clock()
+        self.scheduled_ns = [self.start_ns + offset for offset, _ in self.steps]
+        self._next = 0
+        self._dispatch()
+
+    def _dispatch(self):
+        """Run every step that is due and schedule the next one."""
+        self._after_id = None
+        while self._next < len(self.steps):
+            index = self._next
+            now = self.clock()
+            remaining = self.scheduled_ns[index] - now
+            if remaining > NS_PER_MS // 2:
+                self._after_id = self.app.after(remaining // NS_PER_MS, self._dispatch)
+                return
+            self._next += 1
+            self.steps[index][1]()
+
+    def cancel(self):
+        """Stop the timeline; steps that have not run are dropped."""
+        if self._after_id is not None:
+            try:
+                self.app.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._next = len(self.steps)
@@ -0,0 +1,72 @@
+"""Cancellable after() callbacks owned by a game."""
+
+
+class TimerRegistry:
+    """
+    Keep track of every after() callback a game has scheduled.
+
+    Callbacks are stamped with the generation they were scheduled in.
+    cancel_all() cancels whatever is still pending in O(pending) and
+    starts a new generation, so a callback that Tk has already dequeued
+    (and can no longer be cancelled) sees a stale generation and does
+    nothing instead of touching widgets of a screen that is gone.
+
+    after() and after_cancel() mirror the Tk methods, so a registry can be
+    handed to anything that expects a widget to schedule callbacks with.
+    """
+
+    __slots__ = ('app', 'generation', '_pending', '_next_token')
+
+    def __init__(self, app):
+        """
+        Create an empty registry.
+
+        Args:
+            app: Tk widget used to schedule callbacks
+        """
+        self.app = app
+        self.generation = 0
+        self._pending = {}
+        self._next_token = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def after(self, ms, callback):
+        """
+        Run callback after ms milliseconds unless cancelled first.
+
+        Returns:
+            Token to pass to after_cancel()
+        """
+        token = self._next_token
+        self._next_token += 1
+        generation = self.generation
+
+        def run():
+            if self._pending.pop(token, None) is None or generation != self.generation:
+                return
+            callback()
+
+        self._pending[token] = self.app.after(max(0, int(ms)), run)
+        return token
+
+    def after_cancel(self, token):
+        """Cancel one pending callback; unknown or finished tokens are ignored."""
+        after_id = self._pending.pop(token, None)
+        if after_id is not None:
+            self._cancel(after_id)
+
+    def cancel_all(self):
+        """Cancel every pending callback and start a new generation."""
+        self.generation += 1
+        pending, self._pending = self._pending, {}
+        for after_id in pending.values():
+            self._cancel(after_id)
+
+    def _cancel(self, after_id):
+        """Cancel a Tk callback, tolerating a destroyed application."""
+        try:
+            self.app.after_cancel(after_id)
+        except Exception:
+            pass
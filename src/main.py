@@ -1,21 +1,39 @@
 """
 Memory Games - Train your memory and cognitive skills
 """
-import customtkinter as ctk
-from utils import get_icon_path
-from games.spatial_memory_game import SpatialMemoryGame
-from games.corsi_block_test import CorsiBlockTest
-from games.memory_span_game import MemorySpanGame
-from menu import MainMenu
+import time
+
+_started = time.perf_counter()
+
+from startup import Splash, StartupTimer  # noqa: E402
 
 
 def main():
     """Initialize and run the Memory Games application"""
+    timer = StartupTimer(_started)
+    
+    # Paint a plain-Tk splash before the slow imports below
+    splash = Splash("Memory Games")
+    timer.phase('splash')
+    
+    splash.set_status("Loading interface...")
+    import customtkinter as ctk
+    timer.phase('import_customtkinter')
+    
+    splash.set_status("Loading games...")
+    from utils import get_icon_path, get_startup_log_file
+    from games.registry import GameRegistry
+    from menu import MainMenu
+    from styles import style_counts
+    timer.phase('import_app')
+    
     # Set appearance mode and color theme
     ctk.set_appearance_mode("light")
     ctk.set_default_color_theme("blue")
+    timer.phase('theme')
     
     # Create main application window
+    splash.close()
     app = ctk.CTk()
     app.title("Memory Games")
     app.geometry("800x600")
@@ -28,6 +46,7 @@ def main():
             app.iconbitmap(icon_path)
         except Exception:
             pass  # Icon loading failed, continue without it
+    timer.phase('window')
     
     # Initialize main menu (will be set up after games are created)
     main_menu = None
@@ -37,21 +56,18 @@ def main():
         if main_menu:
             main_menu.show()
     
-    # Initialize games
-    spatial_game = SpatialMemoryGame(app, show_main_menu)
-    corsi_game = CorsiBlockTest(app, show_main_menu)
-    span_game = MemorySpanGame(app, show_main_menu)
+    # Games are imported and created when their button is first pressed
+    games = GameRegistry(app, show_main_menu)
     
     # Create main menu with game callbacks
-    game_callbacks = {
-        'spatial': spatial_game.start,
-        'corsi': corsi_game.start,
-        'span': span_game.start
-    }
+    game_callbacks = {name: games.starter(name) for name in games.names()}
     main_menu = MainMenu(app, game_callbacks)
     
     # Show main menu
     main_menu.show()
+    app.update_idletasks()
+    timer.phase('menu')
+    timer.write(get_startup_log_file(), style_counts(app))
     
     # Start the application
     app.mainloop()
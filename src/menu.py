@@ -1,5 +1,8 @@
 import customtkinter as ctk
-from utils import load_records, reset_records
+from utils import (load_records, load_statistics, reset_records, get_active_profile,
+                   recent_profiles, switch_profile)
+from screens import show_screen
+from styles import font
 
 
 class MainMenu:
@@ -16,14 +19,22 @@ class MainMenu:
         self.app = app
         self.game_callbacks = game_callbacks
         self.tooltip_window = None
+        self.screen = None
+        self.profile_box = None
+        self.record_labels = {}
         
     def show(self):
-        """Display the main menu"""
-        for widget in self.app.winfo_children():
-            widget.destroy()
+        """Display the main menu, building it the first time"""
+        if self.screen is None:
+            self.screen = ctk.CTkFrame(self.app, fg_color="transparent", corner_radius=0)
+            self._build()
+        self._refresh()
+        show_screen(self.app, self.screen)
         
+    def _build(self):
+        """Create the menu widgets; they are kept and refreshed afterwards"""
         # Top frame with help button
-        top_frame = ctk.CTkFrame(self.app, height=50, fg_color="transparent")
+        top_frame = ctk.CTkFrame(self.screen, height=50, fg_color="transparent")
         top_frame.pack(fill="x", padx=20, pady=5)
         top_frame.pack_propagate(False)
         
@@ -32,11 +43,31 @@ class MainMenu:
             text="?",
             width=30,
             height=30,
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=font(18, "bold"),
             fg_color="gray70",
             hover_color="gray60"
         )
         help_btn.pack(side="right", pady=5)
+        
+        # Profile selector - only the most recently used profiles are listed,
+        # typing a new name and pressing Enter creates and switches to it
+        ctk.CTkLabel(
+            top_frame,
+            text="Profile:",
+            font=font(14),
+            text_color="gray30"
+        ).pack(side="left", pady=5, padx=(0, 8))
+        
+        profile_box = ctk.CTkComboBox(
+            top_frame,
+            values=[],
+            width=200,
+            command=self._switch_profile
+        )
+        profile_box.pack(side="left", pady=5)
+        profile_box.bind("<Return>", lambda e: self._switch_profile(profile_box.get()))
+        self.profile_box = profile_box
+        
         help_btn.bind("<Enter>", lambda e: self._show_help_tooltip(help_btn, 
             "Memory Games",
             "Train your memory and cognitive skills\nwith these scientifically-based games.\n\n"
@@ -45,7 +76,7 @@ class MainMenu:
         help_btn.bind("<Leave>", lambda e: self._hide_help_tooltip())
         
         # Main container with left (games) and right (records) sections
-        main_container = ctk.CTkFrame(self.app, fg_color="transparent")
+        main_container = ctk.CTkFrame(self.screen, fg_color="transparent")
         main_container.place(relx=0.5, rely=0.5, anchor="center")
         
         # Left frame - Game buttons
@@ -59,7 +90,7 @@ class MainMenu:
         game1_btn = ctk.CTkButton(
             button_frame,
             text="Spatial Memory Game",
-            font=ctk.CTkFont(size=16),
+            font=font(16),
             width=280,
             height=50,
             command=self.game_callbacks['spatial']
@@ -69,7 +100,7 @@ class MainMenu:
         game2_btn = ctk.CTkButton(
             button_frame,
             text="Corsi Block Test",
-            font=ctk.CTkFont(size=16),
+            font=font(16),
             width=280,
             height=50,
             command=self.game_callbacks['corsi']
@@ -79,7 +110,7 @@ class MainMenu:
         game3_btn = ctk.CTkButton(
             button_frame,
             text="Memory Span",
-            font=ctk.CTkFont(size=16),
+            font=font(16),
             width=280,
             height=50,
             command=self.game_callbacks['span']
@@ -87,14 +118,14 @@ class MainMenu:
         game3_btn.pack(pady=12)
         
         # Right frame - Records table
-        right_frame = ctk.CTkFrame(main_container, fg_color="gray90", corner_radius=10, width=320, height=350)
+        right_frame = ctk.CTkFrame(main_container, fg_color="gray90", corner_radius=10, width=320, height=380)
         right_frame.pack(side="right", fill="none")
         right_frame.pack_propagate(False)
         
         records_title = ctk.CTkLabel(
             right_frame,
             text="🏆 Session Records",
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=font(20, "bold"),
             text_color="gray20"
         )
         records_title.pack(pady=(20, 10))
@@ -104,40 +135,52 @@ class MainMenu:
         
         # Display records for each game
         games = [
-            ("Spatial Memory", "Spatial Memory Game"),
+            ("Spatial Memory 3x3", "Spatial Memory Game"),
             ("Corsi Block", "Corsi Block Test"),
             ("Memory Span", "Memory Span")
         ]
         
-        records = load_records()
-        
         for display_name, game_key in games:
             record_frame = ctk.CTkFrame(records_container, fg_color="white", corner_radius=8)
-            record_frame.pack(fill="x", pady=8, padx=5)
+            record_frame.pack(fill="x", pady=6, padx=5)
+            
+            text_frame = ctk.CTkFrame(record_frame, fg_color="transparent")
+            text_frame.pack(side="left", padx=15, pady=8)
             
             game_label = ctk.CTkLabel(
-                record_frame,
+                text_frame,
                 text=display_name,
-                font=ctk.CTkFont(size=14, weight="bold"),
+                font=font(14, "bold"),
                 text_color="gray30",
-                anchor="w"
+                anchor="w",
+                height=20
             )
-            game_label.pack(side="left", padx=15, pady=12)
+            game_label.pack(anchor="w")
+            
+            stats_label = ctk.CTkLabel(
+                text_frame,
+                text="",
+                font=font(11),
+                text_color="gray50",
+                anchor="w",
+                height=16
+            )
+            stats_label.pack(anchor="w")
             
-            score = records.get(game_key, 0)
             score_label = ctk.CTkLabel(
                 record_frame,
-                text=f"Level {score}",
-                font=ctk.CTkFont(size=16, weight="bold"),
+                text="",
+                font=font(16, "bold"),
                 text_color="#1f6aa5"
             )
-            score_label.pack(side="right", padx=15, pady=12)
+            score_label.pack(side="right", padx=15, pady=8)
+            self.record_labels[game_key] = (stats_label, score_label)
         
         # Reset records button
         reset_btn = ctk.CTkButton(
             right_frame,
             text="Reset Records",
-            font=ctk.CTkFont(size=12),
+            font=font(12),
             width=150,
             height=30,
             fg_color="gray70",
@@ -146,6 +189,33 @@ class MainMenu:
         )
         reset_btn.pack(pady=(10, 20))
         
+    def _refresh(self):
+        """Update the profile selector and the records panel"""
+        self.profile_box.configure(values=recent_profiles())
+        self.profile_box.set(get_active_profile().name)
+        
+        records = load_records()
+        statistics = load_statistics()
+        
+        for game_key, (stats_label, score_label) in self.record_labels.items():
+            stats_label.configure(text=self._format_statistics(statistics.get(game_key)))
+            score_label.configure(text=f"Level {records.get(game_key, 0)}")
+        
+    def _format_statistics(self, stats):
+        """Format running statistics of a game for the records panel"""
+        if stats is None or stats.count == 0:
+            return "No games yet"
+        
+        if stats.trend > 0.25:
+            trend = "▲"
+        elif stats.trend < -0.25:
+            trend = "▼"
+        else:
+            trend = "•"
+        
+        games_text = "game" if stats.count == 1 else "games"
+        return f"{stats.count} {games_text} · avg {stats.mean:.1f} {trend} · streak {stats.streak}"
+    
     def _show_help_tooltip(self, widget, title, description):
         """Show a help tooltip near the widget"""
         self._hide_help_tooltip()
@@ -169,7 +239,7 @@ class MainMenu:
         title_label = ctk.CTkLabel(
             tooltip_frame,
             text=title,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=font(14, "bold"),
             text_color="gray20"
         )
         title_label.pack(pady=(10, 5), padx=15, anchor="w")
@@ -177,7 +247,7 @@ class MainMenu:
         desc_label = ctk.CTkLabel(
             tooltip_frame,
             text=description,
-            font=ctk.CTkFont(size=12),
+            font=font(12),
             text_color="gray40",
             justify="left"
         )
@@ -189,6 +259,13 @@ class MainMenu:
             self.tooltip_window.destroy()
             self.tooltip_window = None
             
+    def _switch_profile(self, name):
+        """Switch to the named profile and refresh the menu"""
+        if not name.strip() or name.strip() == get_active_profile().name:
+            return
+        switch_profile(name)
+        self.show()
+    
     def _reset_records(self):
         """Reset all game records to 0"""
         reset_records()
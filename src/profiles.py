@@ -0,0 +1,220 @@
+"""Participant profiles: an indexed profile list with per-profile storage."""
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_PROFILE = 'Default'
+SHARD_COUNT = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    path TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile_bests (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id),
+    game TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    PRIMARY KEY (profile_id, game)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_profiles_last_used ON profiles (last_used);
+CREATE INDEX IF NOT EXISTS idx_profile_bests_game_level ON profile_bests (game, level);
+"""
+
+
+class Profile:
+    """A participant profile."""
+
+    __slots__ = ('id', 'name', 'folder')
+
+    def __init__(self, profile_id, name, folder):
+        self.id = profile_id
+        self.name = name
+        self.folder = folder
+
+    def __repr__(self):
+        return f"Profile({self.id!r}, {self.name!r})"
+
+
+class ProfileIndex:
+    """
+    Index of all participant profiles.
+
+    The index only holds names, storage locations and each profile's best
+    scores, so switching profile or ranking participants never opens any
+    profile's own records. Each profile's records live in a folder sharded
+    by id; the default profile keeps using the application folder so data
+    recorded before profiles existed stays where it is.
+    """
+
+    def __init__(self, app_folder):
+        """
+        Open (or create) the profile index of an application folder.
+
+        Args:
+            app_folder: Application data folder
+        """
+        self.app_folder = app_folder
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(app_folder, 'profiles.sqlite3'), check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+        if self.get(DEFAULT_PROFILE) is None:
+            self._insert(DEFAULT_PROFILE, '.')
+
+    def _insert(self, name, path=None):
+        """
+        Insert a profile row and return its id.
+
+        Args:
+            name: Display name of the participant
+            path: Folder relative to the app folder; if None, the profile's
+                shard folder, which depends on the new id and is set in
+                the same transaction
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO profiles (name, path, created, last_used) VALUES (?, ?, ?, ?)",
+                (name, path or '', now, now)
+            )
+            profile_id = cursor.lastrowid
+            if path is None:
+                path = os.path.join('profiles', f"{profile_id % SHARD_COUNT:02x}", str(profile_id))
+                self._conn.execute("UPDATE profiles SET path = ? WHERE id = ?", (path, profile_id))
+        return profile_id
+
+    def _profile(self, row):
+        """Build a Profile from an (id, name, path) row."""
+        if row is None:
+            return None
+        profile_id, name, path = row
+        return Profile(profile_id, name, os.path.normpath(os.path.join(self.app_folder, path)))
+
+    def get(self, name):
+        """Return the profile with a name (case-insensitive), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, path FROM profiles WHERE name = ?", (name,)
+            ).fetchone()
+        return self._profile(row)
+
+    def get_by_id(self, profile_id):
+        """Return the profile with an id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, path FROM profiles WHERE id = ?", (profile_id,)
+            ).fetchone()
+        return self._profile(row)
+
+    def create(self, name):
+        """
+        Create a profile, or return the existing one with that name.
+
+        Args:
+            name: Display name of the participant
+
+        Returns:
+            The Profile
+        """
+        name = name.strip()
+        if not name:
+            raise ValueError("Profile name must not be empty")
+        existing = self.get(name)
+        if existing is not None:
+            return existing
+
+        return self.get_by_id(self._insert(name))
+
+    def recent(self, limit=10):
+        """Return the most recently used profiles, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name, path FROM profiles ORDER BY last_used DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._profile(row) for row in rows]
+
+    def iter_all(self, batch_size=500):
+        """Yield every profile by id, fetching them in batches."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, name, path FROM profiles WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._profile(row)
+            last_id = rows[-1][0]
+
+    def get_active(self):
+        """Return the active profile (the default one if none was chosen)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM settings WHERE key = 'active_profile'"
+            ).fetchone()
+        profile = self.get_by_id(int(row[0])) if row else None
+        return profile or self.get(DEFAULT_PROFILE)
+
+    def set_active(self, profile):
+        """Make a profile the active one and mark it as recently used."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('active_profile', ?)",
+                (str(profile.id),)
+            )
+            self._conn.execute(
+                "UPDATE profiles SET last_used = ? WHERE id = ?", (time.time(), profile.id)
+            )
+
+    def set_bests(self, profile_id, best):
+        """
+        Replace the best scores stored for a profile.
+
+        Args:
+            profile_id: Profile id
+            best: Dictionary mapping game name to best level
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM profile_bests WHERE profile_id = ?", (profile_id,))
+            self._conn.executemany(
+                "INSERT INTO profile_bests (profile_id, game, level) VALUES (?, ?, ?)",
+                [(profile_id, game, level) for game, level in best.items() if level]
+            )
+
+    def top_scores(self, game_name, limit=10):
+        """
+        Return the best participants in a game.
+
+        Args:
+            game_name: Name of the game
+            limit: Number of entries to return
+
+        Returns:
+            List of (profile name, level) tuples, best first
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT p.name, b.level FROM profile_bests b "
+                "JOIN profiles p ON p.id = b.profile_id "
+                "WHERE b.game = ? ORDER BY b.level DESC LIMIT ?", (game_name, limit)
+            ).fetchall()
+
+    def close(self):
+        """Close the index."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,414 @@
+"""SQLite backend for game records, sessions and trials."""
+import json
+import sqlite3
+import threading
+import time
+from itertools import groupby
+from aggregates import RunningStats, apply_game_record
+
+
+DEFAULT_USER = 'default'
+
+CLICKS_TABLE = """
+CREATE TABLE IF NOT EXISTS clicks (
+    trial_id INTEGER NOT NULL REFERENCES trials(id),
+    position INTEGER NOT NULL,
+    stimulus INTEGER,
+    response INTEGER,
+    rt_ms REAL,
+    iri_ms REAL,
+    event_ms INTEGER,
+    PRIMARY KEY (trial_id, position)
+) WITHOUT ROWID;
+"""
+
+SCHEMA = CLICKS_TABLE + """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL,
+    reset_at REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    game TEXT NOT NULL,
+    started REAL NOT NULL,
+    layout INTEGER,
+    grid_size INTEGER
+);
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    session_id INTEGER REFERENCES sessions(id),
+    game TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    valid INTEGER NOT NULL DEFAULT 1,
+    ts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    session_id INTEGER REFERENCES sessions(id),
+    game TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    qa TEXT
+);
+CREATE TABLE IF NOT EXISTS aggregates (
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    game TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (user_id, game)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS bests (
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    game TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    PRIMARY KEY (user_id, game)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_trials_user_game_ts
+    ON trials (user_id, game, ts, passed, level);
+CREATE INDEX IF NOT EXISTS idx_trials_session
+    ON trials (session_id);
+CREATE INDEX IF NOT EXISTS idx_games_user_game_ts
+    ON games (user_id, game, ts);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_game_started
+    ON sessions (user_id, game, started);
+"""
+
+
+def _window_condition(ts_column, game_column, since, until, game_name):
+    """Build a WHERE clause and its parameters for a time window and game."""
+    where, params = ["1 = 1"], []
+    if since is not None:
+        where.append(f"{ts_column} >= ?")
+        params.append(since)
+    if until is not None:
+        where.append(f"{ts_column} < ?")
+        params.append(until)
+    if game_name is not None:
+        where.append(f"{game_column} = ?")
+        params.append(game_name)
+    return " AND ".join(where), params
+
+
+def iter_database_records(path, since=None, until=None, game_name=None):
+    """
+    Stream sessions, trials and games of a database as log-format records.
+
+    The database is opened read-only and rows are fetched from cursors as
+    they are consumed, so memory use does not depend on history size.
+    Sessions come first, then trials with their clicks folded back into
+    'seq' and 'resp' lists, then finished games. Every presented stimulus has a clicks row;
+    positions the player never answered have no response.
+
+    Args:
+        path: SQLite database file
+        since: Only include rows at or after this Unix timestamp
+        until: Only include rows before this Unix timestamp
+        game_name: Only include rows of this game
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        condition, params = _window_condition('started', 'game', since, until, game_name)
+        sessions = conn.execute(
+            f"SELECT key, game, started, layout, grid_size FROM sessions "
+            f"WHERE {condition} ORDER BY started",
+            params
+        )
+        for key, game, started, layout, grid_size in sessions:
+            record = {'k': 'session', 's': key, 'g': game, 't': started}
+            if layout is not None:
+                record['layout'] = layout
+            if grid_size is not None:
+                record['grid'] = grid_size
+            yield record
+
+        condition, params = _window_condition('t.ts', 't.game', since, until, game_name)
+        rows = conn.execute(
+            "SELECT t.id, s.key, t.game, t.level, t.passed, t.valid, t.ts, "
+            "c.stimulus, c.response, c.rt_ms, c.iri_ms, c.event_ms "
+            "FROM trials t LEFT JOIN sessions s ON s.id = t.session_id "
+            "LEFT JOIN clicks c ON c.trial_id = t.id "
+            f"WHERE {condition} ORDER BY t.id, c.position",
+            params
+        )
+        for _, trial_rows in groupby(rows, key=lambda row: row[0]):
+            trial_rows = list(trial_rows)
+            _, key, game, level, passed, valid, ts = trial_rows[0][:7]
+            record = {'k': 'trial', 'g': game, 'lv': level, 'ok': passed, 't': ts}
+            if key is not None:
+                record['s'] = key
+            if not valid:
+                record['valid'] = 0
+            answered = [row for row in trial_rows if row[8] is not None]
+            if trial_rows[0][7] is not None or answered:
+                record['seq'] = [row[7] for row in trial_rows if row[7] is not None]
+                record['resp'] = [row[8] for row in answered]
+            if answered and answered[0][9] is not None:
+                record['rt'] = [row[9] for row in answered]
+                record['iri'] = [row[10] for row in answered]
+            if any(row[11] is not None for row in answered):
+                record['ev'] = [row[11] for row in answered]
+            yield record
+
+        condition, params = _window_condition('g.ts', 'g.game', since, until, game_name)
+        games = conn.execute(
+            "SELECT s.key, g.game, g.score, g.ts, g.qa "
+            "FROM games g LEFT JOIN sessions s ON s.id = g.session_id "
+            f"WHERE {condition} ORDER BY g.id",
+            params
+        )
+        for key, game, score, ts, qa in games:
+            record = {'k': 'game', 'g': game, 'score': score, 't': ts}
+            if key is not None:
+                record['s'] = key
+            if qa is not None:
+                record['qa'] = json.loads(qa)
+            yield record
+    finally:
+        conn.close()
+
+
+class RecordDatabase:
+    """
+    Records backend storing every session, trial and click in SQLite.
+
+    Accepts the same records as RecordLog, so it can sit behind
+    RecordsStore unchanged. Best scores live in their own small table and
+    are maintained on insert; time-windowed queries are answered from the
+    (user, game, timestamp) covering index.
+    """
+
+    def __init__(self, path, user=DEFAULT_USER):
+        """
+        Open (or create) the database at path.
+
+        Args:
+            path: SQLite database file
+            user: Name of the user whose records are read and written
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._session_ids = {}
+
+        self.user_id = self._user_id(user)
+        self._reset_at = self._conn.execute(
+            "SELECT reset_at FROM users WHERE id = ?", (self.user_id,)
+        ).fetchone()[0]
+        self.best = dict(self._conn.execute(
+            "SELECT game, level FROM bests WHERE user_id = ?", (self.user_id,)
+        ).fetchall())
+        self.aggregates = {
+            game: RunningStats.from_dict(json.loads(state))
+            for game, state in self._conn.execute(
+                "SELECT game, state FROM aggregates WHERE user_id = ?", (self.user_id,)
+            )
+        }
+
+    def _migrate(self):
+        """Add columns and relax constraints introduced after a database was created."""
+        added = (
+            ('clicks', 'rt_ms', 'REAL'),
+            ('clicks', 'iri_ms', 'REAL'),
+            ('clicks', 'event_ms', 'INTEGER'),
+            ('trials', 'valid', 'INTEGER NOT NULL DEFAULT 1'),
+            ('sessions', 'layout', 'INTEGER'),
+            ('sessions', 'grid_size', 'INTEGER'),
+            ('games', 'qa', 'TEXT'),
+        )
+        with self._conn:
+            for table, column, definition in added:
+                columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            
+            # clicks.response used to be NOT NULL, which kept unanswered
+            # stimuli of failed trials out of the table
+            response_not_null = any(
+                row[1] == 'response' and row[3]
+                for row in self._conn.execute("PRAGMA table_info(clicks)")
+            )
+            if response_not_null:
+                self._conn.execute("ALTER TABLE clicks RENAME TO clicks_old")
+                self._conn.execute(CLICKS_TABLE)
+                self._conn.execute(
+                    "INSERT INTO clicks (trial_id, position, stimulus, response, rt_ms, iri_ms, "
+                    "event_ms) "
+                    "SELECT trial_id, position, stimulus, response, rt_ms, iri_ms, event_ms "
+                    "FROM clicks_old"
+                )
+                self._conn.execute("DROP TABLE clicks_old")
+
+    def _user_id(self, name):
+        """Return the id of a user, creating the user if needed."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO users (name, created) VALUES (?, ?)",
+                (name, time.time())
+            )
+        return self._conn.execute(
+            "SELECT id FROM users WHERE name = ?", (name,)
+        ).fetchone()[0]
+
+    def is_empty(self):
+        """Return True if nothing has been recorded for the user yet."""
+        row = self._conn.execute(
+            "SELECT 1 FROM trials WHERE user_id = ? LIMIT 1", (self.user_id,)
+        ).fetchone()
+        return row is None and not self.best
+
+    def _session_id(self, key):
+        """Resolve a session key to its row id."""
+        if key is None:
+            return None
+        if key not in self._session_ids:
+            row = self._conn.execute(
+                "SELECT id FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+            self._session_ids[key] = row[0] if row else None
+        return self._session_ids[key]
+
+    def append(self, record):
+        """Store a single record."""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """
+        Store several records in one transaction.
+
+        If the transaction fails, the in-memory bests and running
+        statistics are restored, so a batch that is retried is not
+        counted twice.
+
+        Args:
+            records: Iterable of record dictionaries in log format
+        """
+        with self._lock:
+            best = dict(self.best)
+            aggregates = {game: stats.copy() for game, stats in self.aggregates.items()}
+            reset_at = self._reset_at
+            try:
+                with self._conn:
+                    for record in records:
+                        record.setdefault('t', round(time.time(), 3))
+                        self._insert(record)
+            except Exception:
+                self.best, self.aggregates, self._reset_at = best, aggregates, reset_at
+                raise
+
+    def _insert(self, record):
+        """Insert a record; must be called inside a transaction."""
+        kind = record.get('k')
+        conn = self._conn
+
+        if kind == 'session':
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO sessions (key, user_id, game, started, layout, grid_size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (record['s'], self.user_id, record['g'], record['t'], record.get('layout'),
+                 record.get('grid'))
+            )
+            if cursor.rowcount:
+                self._session_ids[record['s']] = cursor.lastrowid
+
+        elif kind == 'reset':
+            conn.execute(
+                "UPDATE users SET reset_at = ? WHERE id = ?", (record['t'], self.user_id)
+            )
+            conn.execute("DELETE FROM bests WHERE user_id = ?", (self.user_id,))
+            conn.execute("DELETE FROM aggregates WHERE user_id = ?", (self.user_id,))
+            self._reset_at = record['t']
+            self.best.clear()
+            self.aggregates.clear()
+
+        elif kind == 'game':
+            conn.execute(
+                "INSERT INTO games (user_id, session_id, game, score, ts, qa) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.user_id, self._session_id(record.get('s')), record['g'],
+                 record['score'], record['t'],
+                 json.dumps(record['qa']) if 'qa' in record else None)
+            )
+            apply_game_record(self.aggregates, record)
+            conn.execute(
+                "INSERT OR REPLACE INTO aggregates (user_id, game, state) VALUES (?, ?, ?)",
+                (self.user_id, record['g'], json.dumps(self.aggregates[record['g']].to_dict()))
+            )
+
+        elif kind in ('trial', 'import'):
+            if kind == 'trial':
+                cursor = conn.execute(
+                    "INSERT INTO trials (user_id, session_id, game, level, passed, valid, ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self.user_id, self._session_id(record.get('s')), record['g'],
+                     record['lv'], 1 if record.get('ok') else 0, record.get('valid', 1),
+                     record['t'])
+                )
+                self._insert_clicks(cursor.lastrowid, record)
+
+            if record.get('ok') and record['lv'] > self.best.get(record['g'], 0):
+                conn.execute(
+                    "INSERT OR REPLACE INTO bests (user_id, game, level) VALUES (?, ?, ?)",
+                    (self.user_id, record['g'], record['lv'])
+                )
+                self.best[record['g']] = record['lv']
+
+    def _insert_clicks(self, trial_id, record):
+        """
+        Insert one row per position of a trial.
+
+        Rows cover the whole presented sequence, so the stimuli after a
+        wrong response are kept; unanswered positions have no response.
+        """
+        sequence = record.get('seq') or []
+        responses = record.get('resp') or []
+        rts = record.get('rt') or []
+        intervals = record.get('iri') or []
+        event_times = record.get('ev') or []
+
+        def at(values, i):
+            return values[i] if i < len(values) else None
+
+        self._conn.executemany(
+            "INSERT INTO clicks (trial_id, position, stimulus, response, rt_ms, iri_ms, event_ms) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (trial_id, i, at(sequence, i), at(responses, i), at(rts, i), at(intervals, i),
+                 at(event_times, i))
+                for i in range(max(len(sequence), len(responses)))
+            ]
+        )
+
+    def best_since(self, game_name, since):
+        """
+        Return the best level cleared in a game since a point in time.
+
+        Args:
+            game_name: Name of the game
+            since: Unix timestamp of the start of the window
+
+        Returns:
+            Best level, or 0 if nothing was cleared in the window
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(level) FROM trials "
+                "WHERE user_id = ? AND game = ? AND ts >= ? AND passed = 1",
+                (self.user_id, game_name, max(since, self._reset_at))
+            ).fetchone()
+        return row[0] or 0
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,323 @@
+"""Append-only segment log for game records."""
+import os
+import json
+import time
+from atomic_io import atomic_write_json, read_json
+from aggregates import RunningStats, apply_game_record
+
+
+SEGMENT_PREFIX = 'records-'
+SEGMENT_SUFFIX = '.log'
+CHECKPOINT_FILE = 'checkpoint.json'
+MAX_SEGMENT_BYTES = 1024 * 1024
+CHECKPOINT_EVERY = 256
+
+
+def apply_record(best, record):
+    """
+    Fold a single log record into a dictionary of best scores.
+
+    Args:
+        best: Dictionary mapping game name to best level, updated in place
+        record: Log record dictionary
+    """
+    kind = record.get('k')
+    if kind == 'reset':
+        best.clear()
+    elif kind in ('trial', 'import') and record.get('ok'):
+        game = record['g']
+        if record['lv'] > best.get(game, 0):
+            best[game] = record['lv']
+
+
+def segment_paths(folder):
+    """Return the segment files of a log folder in write order."""
+    if not os.path.isdir(folder):
+        return []
+    names = [
+        name for name in os.listdir(folder)
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    ]
+    names.sort(key=lambda name: int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+    return [os.path.join(folder, name) for name in names]
+
+
+def read_segment(path, offset=0):
+    """
+    Yield the records of one segment starting at a byte offset.
+
+    Lines that do not parse (a torn write) are skipped.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def iter_log_records(folder):
+    """
+    Stream every record of a log folder without opening it for writing.
+
+    Args:
+        folder: Directory holding the segment files
+    """
+    for path in segment_paths(folder):
+        yield from read_segment(path)
+
+
+class RecordLog:
+    """
+    Append-only log of trial records split into numbered segment files.
+
+    Every record is one compact JSON line. History is never rewritten:
+    a reset is itself a record, and best scores are derived by replaying
+    the log and then kept up to date in memory.
+
+    The log doubles as a journal. Appends are fsynced before they are
+    acknowledged, and every CHECKPOINT_EVERY records the derived bests are
+    written atomically to a checkpoint together with the log position they
+    cover. Opening the log loads the checkpoint and replays only the tail
+    written after it; a torn final line left by a crash is cut off.
+    """
+
+    def __init__(self, folder, max_segment_bytes=MAX_SEGMENT_BYTES,
+                 durable=True, checkpoint_every=CHECKPOINT_EVERY):
+        """
+        Open (or create) the log stored in folder.
+
+        Args:
+            folder: Directory holding the segment files
+            max_segment_bytes: Size after which a new segment is started
+            durable: Whether appends are fsynced before returning
+            checkpoint_every: Records between checkpoints
+        """
+        self.folder = folder
+        self.max_segment_bytes = max_segment_bytes
+        self.durable = durable
+        self.checkpoint_every = checkpoint_every
+        self.best = {}
+        self.aggregates = {}
+        self.replayed = 0
+        self._file = None
+        self._segment_number = 0
+        self._since_checkpoint = 0
+
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        segments = self.segments()
+        if segments:
+            self._segment_number = self._number_of(segments[-1])
+            self._repair_tail(segments[-1])
+        self._recover(segments)
+
+    def _checkpoint_path(self):
+        """Get the path to the checkpoint file."""
+        return os.path.join(self.folder, CHECKPOINT_FILE)
+
+    def _repair_tail(self, path):
+        """Truncate a partially written last line so appends start clean."""
+        with open(path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b'\n':
+                return
+
+            position = size
+            while position > 0:
+                step = min(4096, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step)
+                newline = chunk.rfind(b'\n')
+                if newline != -1:
+                    position += newline + 1
+                    break
+            f.truncate(position)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _recover(self, segments):
+        """Load the checkpoint and replay the log written after it."""
+        checkpoint = read_json(self._checkpoint_path())
+        start_segment, start_offset = 0, 0
+        paths = {self._number_of(path): path for path in segments}
+
+        if isinstance(checkpoint, dict) and checkpoint.get('segment') in paths:
+            segment = checkpoint['segment']
+            offset = checkpoint.get('offset', -1)
+            if 0 <= offset <= os.path.getsize(paths[segment]):
+                self.best = dict(checkpoint.get('best', {}))
+                self.aggregates = {
+                    game: RunningStats.from_dict(state)
+                    for game, state in checkpoint.get('aggregates', {}).items()
+                }
+                start_segment, start_offset = segment, offset
+
+        for path in segments:
+            number = self._number_of(path)
+            if number < start_segment:
+                continue
+            offset = start_offset if number == start_segment else 0
+            for record in read_segment(path, offset):
+                apply_record(self.best, record)
+                apply_game_record(self.aggregates, record)
+                self.replayed += 1
+
+    def checkpoint(self):
+        """Atomically record the current bests and the log position they cover."""
+        if self._file is None:
+            return
+        atomic_write_json(self._checkpoint_path(), {
+            'segment': self._segment_number,
+            'offset': self._file.tell(),
+            'best': self.best,
+            'aggregates': {game: stats.to_dict() for game, stats in self.aggregates.items()}
+        })
+        self._since_checkpoint = 0
+
+    def segments(self):
+        """Return segment paths in write order."""
+        return segment_paths(self.folder)
+
+    def is_empty(self):
+        """Return True if nothing has been logged yet."""
+        return not self.segments()
+
+    @staticmethod
+    def _number_of(path):
+        """Extract the segment number from a segment file name."""
+        name = os.path.basename(path)
+        return int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    def iter_records(self, segments=None):
+        """
+        Yield records from the log in write order.
+
+        A torn last line (e.g. after a crash mid-append) is skipped.
+        """
+        for path in segments if segments is not None else self.segments():
+            yield from read_segment(path)
+
+    def best_since(self, game_name, since):
+        """
+        Return the best level cleared in a game since a point in time.
+
+        This replays the whole log; the SQLite backend answers the same
+        question from an index.
+
+        Args:
+            game_name: Name of the game
+            since: Unix timestamp of the start of the window
+        """
+        best = 0
+        for record in self.iter_records():
+            if record.get('k') == 'reset':
+                best = 0
+            elif (record.get('k') == 'trial' and record.get('ok')
+                    and record.get('g') == game_name and record.get('t', 0) >= since):
+                best = max(best, record['lv'])
+        return best
+
+    def _open_segment(self):
+        """Open the current segment for appending, rolling over when full."""
+        if self._file is not None and self._file.tell() < self.max_segment_bytes:
+            return self._file
+
+        if self._file is not None:
+            self._file.close()
+            self._segment_number += 1
+        elif self._segment_number == 0:
+            self._segment_number = 1
+
+        path = os.path.join(
+            self.folder, f"{SEGMENT_PREFIX}{self._segment_number:06d}{SEGMENT_SUFFIX}"
+        )
+        self._file = open(path, 'ab')
+        return self._file
+
+    def _discard_from(self, offset):
+        """
+        Close the segment and cut it back to offset after a failed write.
+
+        Closing may still flush part of the batch from the file's buffer,
+        so the segment is truncated by path once the handle is gone; the
+        next append reopens it.
+        """
+        f, self._file = self._file, None
+        try:
+            f.close()
+        except OSError:
+            pass
+        try:
+            os.truncate(f.name, offset)
+        except OSError as e:
+            print(f"Error discarding a failed records write: {e}")
+
+    def append(self, record):
+        """
+        Append one record to the log and apply it to the best scores.
+
+        Args:
+            record: Dictionary with at least a 'k' (kind) key
+        """
+        self.append_many([record])
+
+    def append_many(self, records):
+        """
+        Append several records with a single write and fsync.
+
+        The bests and running statistics are only updated once the write
+        has succeeded, so a batch that is retried after an error is not
+        counted twice. If the write or fsync fails, the segment is cut
+        back to its length before the batch, so a retry does not leave
+        the batch in the log twice. A failed checkpoint is reported and
+        retried with the next batch; it does not fail the append, which
+        is already on disk.
+
+        Args:
+            records: Iterable of record dictionaries
+        """
+        records = list(records)
+        lines = []
+        for record in records:
+            record.setdefault('t', round(time.time(), 3))
+            lines.append(json.dumps(record, separators=(',', ':'), ensure_ascii=False))
+        if not lines:
+            return
+
+        f = self._open_segment()
+        offset = f.tell()
+        try:
+            f.write(('\n'.join(lines) + '\n').encode('utf-8'))
+            f.flush()
+            if self.durable:
+                os.fsync(f.fileno())
+        except BaseException:
+            self._discard_from(offset)
+            raise
+
+        for record in records:
+            apply_record(self.best, record)
+            apply_game_record(self.aggregates, record)
+
+        self._since_checkpoint += len(lines)
+        if self._since_checkpoint >= self.checkpoint_every:
+            try:
+                self.checkpoint()
+            except OSError as e:
+                print(f"Error saving records checkpoint: {e}")
+
+    def close(self):
+        """Checkpoint and close the open segment file."""
+        if self._file is not None:
+            if self._since_checkpoint:
+                self.checkpoint()
+            self._file.close()
+            self._file = None
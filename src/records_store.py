@@ -0,0 +1,117 @@
+"""Process-wide in-memory records store with write-behind flushing."""
+import threading
+import time
+from records_log import apply_record
+from aggregates import apply_game_record
+
+
+FLUSH_INTERVAL = 2.0
+
+
+class RecordsStore:
+    """
+    In-memory view of the records log.
+
+    Reads are served from memory. Appended records are queued and written
+    to the backend by a background thread, which coalesces everything
+    queued since the last flush into a single write. The Tk main thread
+    only ever takes a short lock to swap the pending queue.
+    """
+
+    def __init__(self, backend, flush_interval=FLUSH_INTERVAL, on_flush=None):
+        """
+        Create a store over an opened backend and start the writer thread.
+
+        Args:
+            backend: Object with 'best' and 'aggregates' dicts, append_many()
+                and close()
+            flush_interval: Seconds between background flushes
+            on_flush: Called on the writer thread with the best scores
+                after a flush that changed them
+        """
+        self._backend = backend
+        self._best = dict(backend.best)
+        self._aggregates = {
+            game: stats.copy() for game, stats in backend.aggregates.items()
+        }
+        self._flushed_best = dict(self._best)
+        self._on_flush = on_flush
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.flush_interval = flush_interval
+
+        self._thread = threading.Thread(
+            target=self._run, name='records-writer', daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def backend(self):
+        """The backend the store writes to."""
+        return self._backend
+
+    def best(self):
+        """Return a copy of the best score per game."""
+        with self._lock:
+            return dict(self._best)
+
+    def aggregates(self):
+        """Return a copy of the running statistics per game."""
+        with self._lock:
+            return {game: stats.copy() for game, stats in self._aggregates.items()}
+
+    def append(self, record):
+        """
+        Queue a record for writing and apply it to the in-memory state.
+
+        Args:
+            record: Log record dictionary
+        """
+        record.setdefault('t', round(time.time(), 3))
+        with self._lock:
+            self._pending.append(record)
+            apply_record(self._best, record)
+            apply_game_record(self._aggregates, record)
+
+    def flush(self):
+        """Write all queued records to the backend now."""
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                self._backend.append_many(batch)
+            except Exception as e:
+                print(f"Error saving records: {e}")
+                with self._lock:
+                    self._pending[:0] = batch
+                return
+
+            best = self.best()
+            if self._on_flush is not None and best != self._flushed_best:
+                try:
+                    self._on_flush(best)
+                    self._flushed_best = best
+                except Exception as e:
+                    print(f"Error saving records: {e}")
+
+    def _run(self):
+        """Writer thread loop: flush on every tick, and once more when closing."""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Stop the writer thread, flush what is left and close the backend."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._backend.close()
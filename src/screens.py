@@ -0,0 +1,25 @@
+"""Switching between the cached screens of the main window."""
+import weakref
+
+
+_current_screens = weakref.WeakKeyDictionary()
+
+
+def show_screen(app, screen):
+    """
+    Show a screen frame in the main window, hiding the one shown before.
+
+    Screens are built once and kept alive; switching only packs and
+    forgets their root frames, so no widgets are created or destroyed.
+
+    Args:
+        app: The main CTk application window
+        screen: Root frame of the screen to show
+    """
+    current = _current_screens.get(app)
+    if current is screen:
+        return
+    if current is not None:
+        current.pack_forget()
+    screen.pack(fill="both", expand=True)
+    _current_screens[app] = screen
@@ -0,0 +1,113 @@
+"""
+Splash window and phase timings for program startup.
+
+This module only uses tkinter from the standard library, so the splash
+can be painted before customtkinter and the rest of the program are
+imported.
+"""
+import sys
+import json
+import time
+import tkinter as tk
+
+try:
+    # Only present in PyInstaller builds made with --splash, where the
+    # bootloader shows an image while the onefile archive is extracted
+    import pyi_splash
+except ImportError:
+    pyi_splash = None
+
+
+class StartupTimer:
+    """Durations of the named phases of startup."""
+
+    def __init__(self, start=None):
+        """
+        Start timing.
+
+        Args:
+            start: time.perf_counter() value at which startup began; now if None
+        """
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases = []
+
+    def phase(self, name):
+        """Record that a phase ended now; it began when the previous one ended."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def total_ms(self):
+        """Return the milliseconds since startup began."""
+        return (self._last - self.start) * 1000
+
+    def write(self, path, styles=None):
+        """
+        Append the timings of this startup to a JSON-lines log.
+
+        Args:
+            path: Path of the log file
+            styles: Counts of shared style objects (styles.style_counts())
+                to log with the timings, if any
+        """
+        entry = {
+            't': round(time.time(), 3),
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'phases': {name: round(ms, 1) for name, ms in self.phases},
+            'total_ms': round(self.total_ms(), 1)
+        }
+        if styles is not None:
+            entry['styles'] = styles
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            print(f"Error writing startup timings: {e}")
+
+
+class Splash:
+    """A borderless plain-Tk window shown while the program loads."""
+
+    def __init__(self, title, width=320, height=140):
+        """
+        Create the splash and paint it immediately.
+
+        Args:
+            title: Text shown in large type
+            width: Window width in pixels
+            height: Window height in pixels
+        """
+        self.root = tk.Tk()
+        self.root.overrideredirect(True)
+        self.root.configure(background="gray92")
+        x = (self.root.winfo_screenwidth() - width) // 2
+        y = (self.root.winfo_screenheight() - height) // 2
+        self.root.geometry(f"{width}x{height}+{x}+{y}")
+
+        tk.Label(self.root, text=title, font=("TkDefaultFont", 20, "bold"),
+                 background="gray92", foreground="gray20").pack(expand=True, pady=(20, 0))
+        self.status = tk.Label(self.root, text="Loading...", font=("TkDefaultFont", 11),
+                               background="gray92", foreground="gray40")
+        self.status.pack(expand=True, pady=(0, 20))
+        self.root.update()
+
+        if pyi_splash is not None:
+            pyi_splash.close()
+
+    def set_status(self, text):
+        """Show what is being loaded."""
+        if self.root is not None:
+            self.status.configure(text=text)
+            self.root.update()
+
+    def close(self):
+        """
+        Destroy the splash.
+
+        It must be closed before the main window is created, so that the
+        main window becomes Tk's default root.
+        """
+        if self.root is not None:
+            self.root.destroy()
+            self.root = None
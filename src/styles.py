@@ -0,0 +1,68 @@
+"""Fonts and colours shared by every screen."""
+import tkinter.font as tkfont
+import customtkinter as ctk
+
+
+_fonts = {}
+_colors = {}
+
+
+def font(size, weight="normal"):
+    """
+    Return the shared font of a size and weight, creating it on first use.
+
+    Widgets that use the same font share one CTkFont, so building a screen
+    creates no font objects once the fonts it uses exist.
+
+    Args:
+        size: Font size in points
+        weight: "normal" or "bold"
+
+    Returns:
+        ctk.CTkFont
+    """
+    key = (size, weight)
+    shared = _fonts.get(key)
+    if shared is None:
+        shared = _fonts[key] = ctk.CTkFont(size=size, weight=weight)
+    return shared
+
+
+def resolve_color(widget, color):
+    """
+    Return a colour as #rrggbb, resolving each colour name only once.
+
+    Args:
+        widget: Any Tk widget, used to look the name up
+        color: Colour name or #rrggbb string
+
+    Returns:
+        The colour as a #rrggbb string
+    """
+    resolved = _colors.get(color)
+    if resolved is None:
+        if color.startswith("#"):
+            resolved = color
+        else:
+            red, green, blue = widget.winfo_rgb(color)
+            resolved = f"#{red >> 8:02x}{green >> 8:02x}{blue >> 8:02x}"
+        _colors[color] = resolved
+    return resolved
+
+
+def style_counts(root=None):
+    """
+    Count the shared style objects.
+
+    Args:
+        root: Tk root whose named fonts are counted; the default root if None
+
+    Returns:
+        Dictionary with the number of shared fonts, resolved colours and
+        Tk named fonts
+    """
+    return {
+        'fonts': len(_fonts),
+        'colors': len(_colors),
+        'named_fonts': len(tkfont.names(root))
+    }
@@ -0,0 +1,153 @@
+"""Columnar, array-backed storage for per-stimulus trial data."""
+from array import array
+
+
+COLUMNS = (
+    ('level', 'i'),
+    ('stimulus', 'i'),
+    ('scheduled_onset_ns', 'q'),
+    ('onset_ns', 'q'),
+    ('scheduled_offset_ns', 'q'),
+    ('offset_ns', 'q'),
+    ('response', 'i'),
+    ('response_ns', 'q'),
+    ('response_event_ms', 'q'),
+    ('rt_ns', 'q'),
+    ('iri_ns', 'q'),
+    ('correct', 'b'),
+    ('valid', 'b'),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+MISSING = -1
+INITIAL_CAPACITY = 1024
+
+
+class TrialBuffer:
+    """
+    Per-session trial data stored as one typed array per column.
+
+    Each row is one presented stimulus and the response given at its
+    position. A filled row takes 78 bytes of column data; since capacity
+    doubles when the buffer fills up, the allocation per filled row can
+    reach about twice that. column() hands out memoryviews without
+    copying.
+
+    Arrays are allocated ahead of use and replaced, never resized in place,
+    when they fill up, so views handed out earlier stay valid (they keep
+    seeing the data as it was when the buffer grew).
+    """
+
+    __slots__ = ('_arrays', '_length', '_capacity')
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        """
+        Create an empty buffer.
+
+        Args:
+            capacity: Rows to allocate up front
+        """
+        self._capacity = max(1, capacity)
+        self._length = 0
+        self._arrays = self._allocate(self._capacity)
+
+    @staticmethod
+    def _allocate(capacity):
+        """Return fresh columns of a capacity, filled with MISSING."""
+        return {name: array(code, [MISSING]) * capacity for name, code in COLUMNS}
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def nbytes(self):
+        """Bytes allocated by all columns."""
+        return sum(a.itemsize * len(a) for a in self._arrays.values())
+
+    def _grow(self):
+        """Replace every column with one of double capacity."""
+        extra = self._capacity
+        for name, code in COLUMNS:
+            grown = array(code, self._arrays[name])
+            grown.extend(array(code, [MISSING]) * extra)
+            self._arrays[name] = grown
+        self._capacity += extra
+
+    def append(self, level, stimulus, onset_ns=MISSING, offset_ns=MISSING,
+               response=MISSING, response_ns=MISSING, correct=MISSING,
+               scheduled_onset_ns=MISSING, scheduled_offset_ns=MISSING):
+        """
+        Add a row and return its index.
+
+        Args:
+            level: Level the stimulus belongs to
+            stimulus: Index of the presented stimulus
+            onset_ns: perf_counter_ns() when the stimulus appeared
+            offset_ns: perf_counter_ns() when it disappeared
+            response: Index the player responded with
+            response_ns: perf_counter_ns() of the response
+            correct: 1 if the response matched, 0 if not
+            scheduled_onset_ns: When the stimulus was due to appear
+            scheduled_offset_ns: When the stimulus was due to disappear
+        """
+        if self._length == self._capacity:
+            self._grow()
+        row = self._length
+        arrays = self._arrays
+        arrays['level'][row] = level
+        arrays['stimulus'][row] = stimulus
+        arrays['scheduled_onset_ns'][row] = scheduled_onset_ns
+        arrays['onset_ns'][row] = onset_ns
+        arrays['scheduled_offset_ns'][row] = scheduled_offset_ns
+        arrays['offset_ns'][row] = offset_ns
+        arrays['response'][row] = response
+        arrays['response_ns'][row] = response_ns
+        arrays['response_event_ms'][row] = MISSING
+        arrays['rt_ns'][row] = MISSING
+        arrays['iri_ns'][row] = MISSING
+        arrays['correct'][row] = correct
+        arrays['valid'][row] = MISSING
+        self._length = row + 1
+        return row
+
+    def set(self, row, column, value):
+        """
+        Set a single cell.
+
+        Args:
+            row: Row index returned by append()
+            column: Column name
+            value: New value
+        """
+        if not 0 <= row < self._length:
+            raise IndexError(f"row {row} out of range")
+        self._arrays[column][row] = value
+
+    def get(self, row, column):
+        """Return a single cell."""
+        if not 0 <= row < self._length:
+            raise IndexError(f"row {row} out of range")
+        return self._arrays[column][row]
+
+    def row(self, row):
+        """Return a row as a dictionary keyed by column name."""
+        if not 0 <= row < self._length:
+            raise IndexError(f"row {row} out of range")
+        return {name: self._arrays[name][row] for name in COLUMN_NAMES}
+
+    def column(self, name):
+        """
+        Return a zero-copy, read-only view of a column's filled rows.
+
+        Args:
+            name: One of COLUMN_NAMES
+        """
+        return memoryview(self._arrays[name]).toreadonly()[:self._length]
+
+    def columns(self):
+        """Return views of every column keyed by name."""
+        return {name: self.column(name) for name in COLUMN_NAMES}
+
+    def clear(self):
+        """Drop all rows, leaving previously returned views untouched."""
+        self._arrays = self._allocate(self._capacity)
+        self._length = 0
@@ -2,6 +2,20 @@
 import os
 import sys
 import json
+import time
+import uuid
+import atexit
+from records_log import RecordLog, iter_log_records
+from records_store import RecordsStore
+from profiles import ProfileIndex
+
+
+STORAGE_ENV_VAR = 'MEMORYGAMES_STORAGE'
+
+_records_store = None
+_profile_index = None
+_active_profile = None
+_current_sessions = {}
 
 
 def _get_app_folder():
@@ -18,21 +32,67 @@ def _get_app_folder():
     return app_folder
 
 
-def _get_records_file():
-    """Get the path to the records JSON file."""
-    return os.path.join(_get_app_folder(), 'records.json')
+def _get_records_file(folder):
+    """Get the path to the legacy records JSON file in a profile folder."""
+    return os.path.join(folder, 'records.json')
 
 
-def load_records():
-    """Load records from JSON file."""
-    try:
-        records_file = _get_records_file()
-        if os.path.exists(records_file):
-            with open(records_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception as e:
-        print(f"Error loading records: {e}")
+def _get_log_folder(folder):
+    """Get the path to the folder holding the records log segments."""
+    return os.path.join(folder, 'records')
+
+
+def _get_database_file(folder):
+    """Get the path to the SQLite records database."""
+    return os.path.join(folder, 'records.sqlite3')
+
+
+def get_startup_log_file():
+    """Get the path to the log of startup phase timings."""
+    return os.path.join(_get_app_folder(), 'startup.jsonl')
+
+
+def _open_records_backend(profile):
+    """
+    Open the configured records backend of a profile.
     
+    The append-only log is the default; setting MEMORYGAMES_STORAGE=sqlite
+    selects the SQLite trial database instead.
+    """
+    if not os.path.exists(profile.folder):
+        os.makedirs(profile.folder)
+    if os.getenv(STORAGE_ENV_VAR, 'log').lower() == 'sqlite':
+        from records_db import RecordDatabase
+        return RecordDatabase(_get_database_file(profile.folder), user=profile.name)
+    return RecordLog(_get_log_folder(profile.folder))
+
+
+def _get_profile_index():
+    """Open the profile index on first use."""
+    global _profile_index
+    if _profile_index is None:
+        _profile_index = ProfileIndex(_get_app_folder())
+        atexit.register(_close_profile_index)
+    return _profile_index
+
+
+def _close_profile_index():
+    """Close the records store and the profile index at exit."""
+    _close_records_store()
+    if _profile_index is not None:
+        _profile_index.close()
+
+
+def get_active_profile():
+    """Get the profile whose records are currently read and written."""
+    global _active_profile
+    if _active_profile is None:
+        _active_profile = _get_profile_index().get_active()
+    return _active_profile
+
+
+def _default_records():
+    """Return records with every game at zero."""
     return {
         'Spatial Memory Game': 0,
         'Corsi Block Test': 0,
@@ -40,45 +100,337 @@ def load_records():
     }
 
 
+def _get_records_store():
+    """Open the process-wide records store on first use."""
+    global _records_store
+    if _records_store is None:
+        profile = get_active_profile()
+        backend = _open_records_backend(profile)
+        if backend.is_empty():
+            _import_legacy_records(backend, profile.folder)
+        index = _get_profile_index()
+        _records_store = RecordsStore(
+            backend, on_flush=lambda best: index.set_bests(profile.id, best)
+        )
+    return _records_store
+
+
+def _close_records_store():
+    """Flush and close the records store of the active profile."""
+    global _records_store
+    if _records_store is not None:
+        _records_store.close()
+        _records_store = None
+
+
+def switch_profile(name):
+    """
+    Make a profile active, creating it if it does not exist.
+    
+    Only the new profile's own records are opened; other profiles are
+    never loaded.
+    
+    Args:
+        name: Profile name
+        
+    Returns:
+        The active Profile
+    """
+    global _active_profile
+    index = _get_profile_index()
+    profile = index.create(name)
+    if _active_profile is None or profile.id != _active_profile.id:
+        _close_records_store()
+        _current_sessions.clear()
+    index.set_active(profile)
+    _active_profile = profile
+    return profile
+
+
+def recent_profiles(limit=10):
+    """Get the names of the most recently used profiles."""
+    return [profile.name for profile in _get_profile_index().recent(limit)]
+
+
+def iter_profiles(names=None):
+    """
+    Yield profiles from the index without loading their records.
+    
+    Args:
+        names: Profile names to yield; all profiles if None
+    """
+    index = _get_profile_index()
+    if names is None:
+        yield from index.iter_all()
+        return
+    for name in names:
+        profile = index.get(name)
+        if profile is None:
+            raise ValueError(f"Unknown profile: {name}")
+        yield profile
+
+
+def iter_profile_records(profile, since=None, until=None, game_name=None):
+    """
+    Stream the session, trial and game records of a profile from disk.
+    
+    Both backends are read if both exist. Records still queued in a
+    running application's write-behind store are not included.
+    
+    Args:
+        profile: Profile to read
+        since: Only include records at or after this Unix timestamp
+        until: Only include records before this Unix timestamp
+        game_name: Only include records of this game
+    """
+    for record in iter_log_records(_get_log_folder(profile.folder)):
+        if record.get('k') not in ('session', 'trial', 'game'):
+            continue
+        if game_name is not None and record.get('g') != game_name:
+            continue
+        t = record.get('t', 0)
+        if (since is not None and t < since) or (until is not None and t >= until):
+            continue
+        yield record
+    
+    database_file = _get_database_file(profile.folder)
+    if os.path.exists(database_file):
+        from records_db import iter_database_records
+        yield from iter_database_records(database_file, since, until, game_name)
+
+
+def top_scores(game_name, limit=10):
+    """
+    Get the best participants in a game across all profiles.
+    
+    Args:
+        game_name: Name of the game
+        limit: Number of entries
+        
+    Returns:
+        List of (profile name, level) tuples, best first
+    """
+    return _get_profile_index().top_scores(game_name, limit)
+
+
+def flush_records():
+    """Write all queued records to disk without waiting for the writer."""
+    if _records_store is not None:
+        _records_store.flush()
+
+
+def _import_legacy_records(backend, folder):
+    """Seed an empty backend with the best scores from records.json."""
+    try:
+        records_file = _get_records_file(folder)
+        if os.path.exists(records_file):
+            with open(records_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            backend.append_many([
+                {'k': 'import', 'g': game_name, 'lv': score, 'ok': 1}
+                for game_name, score in legacy.items() if score
+            ])
+    except Exception as e:
+        print(f"Error importing records: {e}")
+
+
+def load_records():
+    """Load best scores from the in-memory records store."""
+    records = _default_records()
+    try:
+        records.update(_get_records_store().best())
+    except Exception as e:
+        print(f"Error loading records: {e}")
+    return records
+
+
 def save_records(records):
-    """Save records to JSON file."""
+    """Replace the current best scores by appending a reset and new bests."""
+    try:
+        store = _get_records_store()
+        store.append({'k': 'reset'})
+        for game_name, score in records.items():
+            if score:
+                store.append({'k': 'import', 'g': game_name, 'lv': score, 'ok': 1})
+    except Exception as e:
+        print(f"Error saving records: {e}")
+
+
+def start_session(game_name, layout=None, grid_size=None):
+    """
+    Start a new play session of a game; later trials are attributed to it.
+    
+    Args:
+        game_name: Name of the game
+        layout: Index of the precomputed board layout the session is played on
+        grid_size: Rows and columns of the grid the session is played on
+        
+    Returns:
+        Session key
+    """
+    key = uuid.uuid4().hex
+    _current_sessions[game_name] = key
+    record = {'k': 'session', 's': key, 'g': game_name}
+    if layout is not None:
+        record['layout'] = layout
+    if grid_size is not None:
+        record['grid'] = grid_size
+    try:
+        _get_records_store().append(record)
+    except Exception as e:
+        print(f"Error saving records: {e}")
+    return key
+
+
+def log_trial(game_name, level, passed=True, sequence=None, responses=None,
+              response_times=None, intervals=None, valid=True, event_times=None):
+    """
+    Append a single trial (one attempted level) to the records store.
+    
+    Args:
+        game_name: Name of the game
+        level: Level that was attempted
+        passed: Whether the level was completed
+        sequence: Stimuli shown in the trial
+        responses: Responses given by the player
+        response_times: Reaction time of each response in ms, measured
+            from the end of the presentation
+        intervals: Time between consecutive responses in ms
+        valid: False if the stimuli were not shown for their intended time
+        event_times: Tk event time of the press behind each response, in
+            ms of the windowing system's clock; None where unknown
+    """
+    record = {
+        'k': 'trial',
+        'g': game_name,
+        'lv': level,
+        'ok': 1 if passed else 0
+    }
+    if game_name in _current_sessions:
+        record['s'] = _current_sessions[game_name]
+    if sequence is not None:
+        record['seq'] = list(sequence)
+    if responses is not None:
+        record['resp'] = list(responses)
+    if response_times is not None:
+        record['rt'] = list(response_times)
+    if intervals is not None:
+        record['iri'] = list(intervals)
+    if event_times is not None:
+        record['ev'] = list(event_times)
+    if not valid:
+        record['valid'] = 0
     try:
-        records_file = _get_records_file()
-        with open(records_file, 'w', encoding='utf-8') as f:
-            json.dump(records, f, indent=4, ensure_ascii=False)
+        _get_records_store().append(record)
     except Exception as e:
         print(f"Error saving records: {e}")
 
 
-def update_record(records, game_name, score):
+def update_record(records, game_name, score, sequence=None, responses=None,
+                  response_times=None, intervals=None, valid=True, event_times=None):
     """
-    Update record if new score is better.
+    Log a cleared level and update the record if the score is better.
     
     Args:
         records: Dictionary of game records
         game_name: Name of the game
         score: New score to compare
+        sequence: Stimuli shown in the cleared level
+        responses: Responses given by the player
+        response_times: Reaction time of each response in ms
+        intervals: Time between consecutive responses in ms
+        valid: False if the stimuli were not shown for their intended time
+        event_times: Tk event time of the press behind each response, in ms
         
     Returns:
         Updated records dictionary
     """
+    log_trial(game_name, score, True, sequence, responses, response_times, intervals, valid,
+              event_times)
     if score > records.get(game_name, 0):
         records[game_name] = score
-        save_records(records)
     return records
 
 
+def record_game(game_name, score, presentation=None):
+    """
+    Record a finished game and fold its score into the running statistics.
+    
+    Args:
+        game_name: Name of the game
+        score: Final score (levels cleared)
+        presentation: Deadline-miss statistics of the session's stimuli
+    """
+    record = {'k': 'game', 'g': game_name, 'score': score}
+    if presentation is not None:
+        record['qa'] = presentation
+    if game_name in _current_sessions:
+        record['s'] = _current_sessions[game_name]
+    try:
+        _get_records_store().append(record)
+    except Exception as e:
+        print(f"Error saving records: {e}")
+
+
+def load_statistics():
+    """
+    Get the running statistics of every game.
+    
+    Returns:
+        Dictionary mapping game name to RunningStats; games never finished
+        are missing
+    """
+    try:
+        return _get_records_store().aggregates()
+    except Exception as e:
+        print(f"Error loading records: {e}")
+        return {}
+
+
+def best_since(game_name, days):
+    """
+    Get the best level cleared in a game within the last days.
+    
+    Args:
+        game_name: Name of the game
+        days: Length of the window in days
+        
+    Returns:
+        Best level in the window
+    """
+    try:
+        store = _get_records_store()
+        store.flush()
+        return store.backend.best_since(game_name, time.time() - days * 86400)
+    except Exception as e:
+        print(f"Error loading records: {e}")
+        return 0
+
+
 def reset_records():
     """Reset all records to zero."""
-    records = {
-        'Spatial Memory Game': 0,
-        'Corsi Block Test': 0,
-        'Memory Span': 0
-    }
+    records = _default_records()
     save_records(records)
     return records
 
 
+def get_asset_path(filename):
+    """
+    Get the path of a file shipped in the assets folder.
+    
+    Args:
+        filename: Name of the asset file
+        
+    Returns:
+        Path to the file (it may not exist)
+    """
+    if getattr(sys, 'frozen', False):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, 'assets', filename)
+
+
 def get_icon_path():
     """Get path to application icon."""
     try:
@@ -0,0 +1,5 @@
+"""Make the application modules in src/ importable the way main.py sees them."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
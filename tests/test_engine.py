@@ -0,0 +1,104 @@
+"""Game rules played headlessly on the engines."""
+from games.engine import (
+    CORRECT, PASSED, FAILED, SequenceEngine, SpatialEngine, CorsiEngine, SpanEngine,
+    presentation_ms, simulate, span_player
+)
+
+
+def play_level(engine, responses):
+    """Begin a level and give responses until one ends it."""
+    engine.step()
+    result = None
+    for response in responses:
+        result = engine.respond(response)
+        if result != CORRECT:
+            break
+    return result
+
+
+def test_sequence_grows_by_one_stimulus_per_level():
+    engine = SpanEngine(seed=1)
+    first = list(engine.step())
+    assert len(first) == 1
+    assert engine.respond(first[0]) == PASSED
+    engine.complete_level()
+
+    second = engine.step()
+    assert second[:1] == first
+    assert len(second) == 2
+    assert engine.level == 2
+    assert engine.score == 1
+
+
+def test_responses_are_judged_in_order():
+    engine = SequenceEngine(4, seed=3)
+    engine.step()
+    engine.complete_level()
+    sequence = list(engine.step())
+
+    assert engine.respond(sequence[0]) == CORRECT
+    assert engine.respond(sequence[1]) == PASSED
+    assert not engine.over
+
+
+def test_wrong_response_ends_the_game():
+    engine = SpanEngine(seed=2)
+    sequence = engine.step()
+    assert play_level(engine, [(sequence[0] + 1) % 10]) == FAILED
+    assert engine.over
+    assert engine.score == 0
+
+
+def test_reset_starts_over():
+    engine = CorsiEngine(12, seed=4)
+    play_level(engine, [99])
+    engine.reset()
+    assert (engine.level, engine.sequence, engine.responses, engine.over) == (1, [], [], False)
+
+
+def test_seeded_engines_repeat_their_sequences():
+    a, b = SpanEngine(seed=7), SpanEngine(seed=7)
+    for _ in range(5):
+        assert a.step() == b.step()
+
+
+def test_stimuli_stay_on_the_board():
+    engine = SpatialEngine(3, seed=5)
+    engine.resize(5)
+    for _ in range(200):
+        engine.step()
+    assert engine.stimulus_count == 25
+    assert max(engine.sequence) < 25
+
+    corsi = CorsiEngine(12, seed=5)
+    corsi.set_blocks(9)
+    for _ in range(200):
+        corsi.step()
+    assert max(corsi.sequence) < 9
+
+
+def test_presentation_speeds_up_to_a_floor():
+    assert presentation_ms(1) == 770
+    assert presentation_ms(10) == 500
+    assert presentation_ms(50) == 400
+
+
+def test_perfect_player_reaches_its_span():
+    scores, trials = simulate(SpanEngine(seed=0), span_player(5), games=50)
+    assert scores == [5] * 50
+    # Levels 1-5 answered in full; at level 6, five right and one wrong
+    assert trials == 50 * (1 + 2 + 3 + 4 + 5 + 6)
+
+
+def test_simulated_games_stop_at_max_level():
+    def oracle(engine):
+        return list(engine.sequence)
+
+    scores, _ = simulate(SpatialEngine(3, seed=0), oracle, games=3, max_level=12)
+    assert scores == [12, 12, 12]
+
+
+def test_lapsing_player_never_beats_its_span():
+    scores, _ = simulate(CorsiEngine(12, seed=9), span_player(6, lapse_rate=0.1), games=500)
+    assert max(scores) <= 6
+    assert min(scores) < 6
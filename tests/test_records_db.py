@@ -0,0 +1,125 @@
+"""SQLite records backend: schema migration and round trips."""
+import sqlite3
+from records_db import RecordDatabase, iter_database_records
+
+
+# Tables as the first SQLite release created them: no timing, validity,
+# layout or presentation columns, and clicks.response NOT NULL
+FIRST_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL,
+    reset_at REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE sessions (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    game TEXT NOT NULL,
+    started REAL NOT NULL
+);
+CREATE TABLE trials (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    session_id INTEGER REFERENCES sessions(id),
+    game TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE TABLE clicks (
+    trial_id INTEGER NOT NULL REFERENCES trials(id),
+    position INTEGER NOT NULL,
+    stimulus INTEGER,
+    response INTEGER NOT NULL,
+    PRIMARY KEY (trial_id, position)
+) WITHOUT ROWID;
+CREATE TABLE bests (
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    game TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    PRIMARY KEY (user_id, game)
+) WITHOUT ROWID;
+INSERT INTO users (id, name, created) VALUES (1, 'default', 0);
+INSERT INTO sessions (id, key, user_id, game, started) VALUES (1, 'old', 1, 'Memory Span', 10);
+INSERT INTO trials (id, user_id, session_id, game, level, passed, ts)
+    VALUES (1, 1, 1, 'Memory Span', 2, 1, 11);
+INSERT INTO clicks (trial_id, position, stimulus, response) VALUES (1, 0, 4, 4), (1, 1, 7, 7);
+INSERT INTO bests (user_id, game, level) VALUES (1, 'Memory Span', 2);
+"""
+
+
+def columns(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[1]: row[3] for row in conn.execute(f"PRAGMA table_info({table})")}
+    finally:
+        conn.close()
+
+
+def test_first_release_database_is_migrated(tmp_path):
+    path = str(tmp_path / 'records.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(FIRST_SCHEMA)
+    conn.close()
+
+    db = RecordDatabase(path)
+    assert db.best == {'Memory Span': 2}
+    db.close()
+
+    clicks = columns(path, 'clicks')
+    assert {'rt_ms', 'iri_ms', 'event_ms'} <= set(clicks)
+    assert clicks['response'] == 0
+    assert 'valid' in columns(path, 'trials')
+    assert {'layout', 'grid_size'} <= set(columns(path, 'sessions'))
+    assert 'qa' in columns(path, 'games')
+
+    # Old clicks survive the rebuild of the table
+    trials = [r for r in iter_database_records(path) if r['k'] == 'trial']
+    assert trials == [{'k': 'trial', 'g': 'Memory Span', 'lv': 2, 'ok': 1, 't': 11, 's': 'old',
+                       'seq': [4, 7], 'resp': [4, 7]}]
+
+
+def test_migrated_database_keeps_unanswered_stimuli(tmp_path):
+    path = str(tmp_path / 'records.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(FIRST_SCHEMA)
+    conn.close()
+
+    db = RecordDatabase(path)
+    db.append({'k': 'trial', 'g': 'Memory Span', 'lv': 3, 'ok': 0, 't': 20,
+               'seq': [1, 2, 3], 'resp': [1, 5], 'rt': [400.0, 250.0], 'iri': [400.0, 250.0],
+               'ev': [1000, 1250]})
+    db.close()
+
+    failed = [r for r in iter_database_records(path) if r['k'] == 'trial'][-1]
+    assert failed['seq'] == [1, 2, 3]
+    assert failed['resp'] == [1, 5]
+    assert failed['rt'] == [400.0, 250.0]
+    assert failed['ev'] == [1000, 1250]
+
+
+def test_migration_is_idempotent(tmp_path):
+    path = str(tmp_path / 'records.db')
+    RecordDatabase(path).close()
+    before = {table: columns(path, table) for table in ('clicks', 'trials', 'sessions', 'games')}
+    RecordDatabase(path).close()
+    assert {table: columns(path, table) for table in before} == before
+
+
+def test_sessions_and_games_round_trip(tmp_path):
+    path = str(tmp_path / 'records.db')
+    qa = {'stimuli': 6, 'misses': 1, 'miss_rate': 0.17, 'mean_dev_ms': 2.5, 'max_dev_ms': 9.0}
+    db = RecordDatabase(path)
+    db.append_many([
+        {'k': 'session', 's': 'a', 'g': 'Corsi Block Test', 't': 1, 'layout': 0},
+        {'k': 'game', 's': 'a', 'g': 'Corsi Block Test', 'score': 3, 't': 2, 'qa': qa},
+    ])
+    db.close()
+
+    records = list(iter_database_records(path))
+    assert records == [
+        {'k': 'session', 's': 'a', 'g': 'Corsi Block Test', 't': 1, 'layout': 0},
+        {'k': 'game', 's': 'a', 'g': 'Corsi Block Test', 'score': 3, 't': 2, 'qa': qa},
+    ]
@@ -0,0 +1,136 @@
+"""Recovery of the append-only records log."""
+import os
+import pytest
+from records_log import RecordLog, iter_log_records
+
+
+def trial(level, passed=True, game='Memory Span'):
+    return {'k': 'trial', 'g': game, 'lv': level, 'ok': 1 if passed else 0}
+
+
+def game(score, name='Memory Span'):
+    return {'k': 'game', 'g': name, 'score': score}
+
+
+def test_records_survive_reopening(tmp_path):
+    log = RecordLog(str(tmp_path))
+    log.append_many([trial(1), trial(2), trial(3, passed=False), game(2)])
+    log.close()
+
+    reopened = RecordLog(str(tmp_path))
+    assert reopened.best == {'Memory Span': 2}
+    assert reopened.aggregates['Memory Span'].count == 1
+    assert [r['lv'] for r in iter_log_records(str(tmp_path)) if r['k'] == 'trial'] == [1, 2, 3]
+
+
+def test_torn_last_line_is_cut_off(tmp_path):
+    log = RecordLog(str(tmp_path))
+    log.append_many([trial(1), trial(2)])
+    log._file.close()
+    segment = log.segments()[-1]
+    with open(segment, 'ab') as f:
+        f.write(b'{"k":"trial","g":"Memory Span","lv":9,"o')
+    size = os.path.getsize(segment)
+
+    reopened = RecordLog(str(tmp_path))
+    assert os.path.getsize(segment) < size
+    assert reopened.best == {'Memory Span': 2}
+
+    # Appends after the repair start on a line of their own
+    reopened.append(trial(3))
+    reopened.close()
+    assert [r['lv'] for r in iter_log_records(str(tmp_path))] == [1, 2, 3]
+
+
+def test_reopening_replays_only_the_tail_after_the_checkpoint(tmp_path):
+    log = RecordLog(str(tmp_path), checkpoint_every=2)
+    log.append_many([trial(1), trial(2)])
+    log.append(trial(3))
+    # Leave the last record uncheckpointed, as a crash would
+    log._file.close()
+
+    reopened = RecordLog(str(tmp_path))
+    assert reopened.replayed == 1
+    assert reopened.best == {'Memory Span': 3}
+
+
+def test_checkpoint_beyond_the_segment_is_ignored(tmp_path):
+    log = RecordLog(str(tmp_path), checkpoint_every=1)
+    log.append_many([trial(1), trial(2)])
+    log.close()
+    segment = log.segments()[-1]
+    with open(segment, 'rb+') as f:
+        f.truncate(0)
+
+    reopened = RecordLog(str(tmp_path))
+    assert reopened.best == {}
+
+
+def test_reset_clears_bests_on_replay(tmp_path):
+    log = RecordLog(str(tmp_path))
+    log.append_many([trial(4), {'k': 'reset'}, trial(2)])
+    log.close()
+
+    assert RecordLog(str(tmp_path)).best == {'Memory Span': 2}
+
+
+def test_segments_roll_over_and_replay_in_order(tmp_path):
+    log = RecordLog(str(tmp_path), max_segment_bytes=200)
+    for level in range(1, 21):
+        log.append(trial(level))
+    log.close()
+
+    assert len(log.segments()) > 1
+    assert [r['lv'] for r in iter_log_records(str(tmp_path))] == list(range(1, 21))
+    assert RecordLog(str(tmp_path)).best == {'Memory Span': 20}
+
+
+def test_failed_fsync_is_cut_back_and_retried_once(tmp_path, monkeypatch):
+    log = RecordLog(str(tmp_path))
+    log.append(game(1))
+    size = os.path.getsize(log.segments()[-1])
+
+    def fail(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, 'fsync', fail)
+    with pytest.raises(OSError):
+        log.append(game(5))
+    monkeypatch.undo()
+
+    assert os.path.getsize(log.segments()[-1]) == size
+    assert log.aggregates['Memory Span'].count == 1
+
+    log.append(game(5))
+    log.close()
+    assert [r['score'] for r in iter_log_records(str(tmp_path))] == [1, 5]
+    assert RecordLog(str(tmp_path)).aggregates['Memory Span'].count == 2
+
+
+def test_partly_buffered_write_is_cut_back(tmp_path):
+    log = RecordLog(str(tmp_path), durable=False)
+    log.append(trial(1))
+    size = os.path.getsize(log.segments()[-1])
+
+    class FailingFlush:
+        """The segment file, failing on flush after the write was buffered."""
+
+        def __init__(self, f):
+            self.f = f
+
+        def __getattr__(self, name):
+            return getattr(self.f, name)
+
+        def flush(self):
+            self.f.flush()
+            raise OSError("device error")
+
+    log._file = FailingFlush(log._file)
+    with pytest.raises(OSError):
+        log.append(trial(2))
+
+    assert os.path.getsize(log.segments()[-1]) == size
+    assert log.best == {'Memory Span': 1}
+    log.append(trial(2))
+    log.close()
+    assert [r['lv'] for r in iter_log_records(str(tmp_path))] == [1, 2]
@@ -0,0 +1,81 @@
+"""Table-driven game flow."""
+import pytest
+from games.state_machine import StateMachine
+
+
+class Game:
+    def __init__(self):
+        self.calls = []
+
+    def begin(self, *args):
+        self.calls.append(('begin', args))
+
+
+def machine(game, transitions=None):
+    return StateMachine(transitions or [
+        ('idle', 'start', 'playing', 'begin'),
+        ('playing', 'fail', 'over', None),
+        ('over', 'restart', 'idle', None),
+    ], 'idle', game)
+
+
+def test_events_follow_the_table():
+    game = Game()
+    flow = machine(game)
+    assert flow.fire('start', 3)
+    assert flow.state == 'playing'
+    assert game.calls == [('begin', (3,))]
+    assert flow.fire('fail')
+    assert flow.state == 'over'
+
+
+def test_events_without_a_transition_are_rejected():
+    game = Game()
+    flow = machine(game)
+    assert not flow.fire('fail')
+    assert flow.state == 'idle'
+    assert game.calls == []
+
+
+def test_hooks_see_transitions_before_the_action():
+    game = Game()
+    flow = machine(game)
+    seen = []
+
+    def hook(previous, event, next_state):
+        seen.append((previous, event, next_state, list(game.calls)))
+
+    flow.add_hook(hook)
+    flow.fire('start')
+    flow.fire('start')
+    assert seen == [('idle', 'start', 'playing', [])]
+
+    flow.remove_hook(hook)
+    flow.fire('fail')
+    assert len(seen) == 1
+
+
+def test_action_may_fire_follow_up_events():
+    flow = None
+
+    def begin():
+        flow.fire('fail')
+
+    flow = StateMachine([
+        ('idle', 'start', 'playing', begin),
+        ('playing', 'fail', 'over', None),
+    ], 'idle')
+    flow.fire('start')
+    assert flow.state == 'over'
+
+
+def test_reset_returns_to_the_initial_state():
+    flow = machine(Game())
+    flow.fire('start')
+    flow.reset()
+    assert flow.state == 'idle'
+
+
+def test_duplicate_transitions_are_refused():
+    with pytest.raises(ValueError):
+        StateMachine([('idle', 'start', 'a', None), ('idle', 'start', 'b', None)], 'idle')